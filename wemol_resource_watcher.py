@@ -9,18 +9,271 @@ wemol平台作业模块调度资源监控记录程序
 
 import subprocess
 import json
+import socket
+import http.client
 import csv
 import time
 import re
 import os
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime
+import threading
+import queue
+import asyncio
+import atexit
+import shutil
+import signal
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import IO, Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+try:
+    import orjson
+except ImportError:  # 未安装orjson时使用标准库json解析
+    orjson = None
+
+try:
+    import pynvml
+except ImportError:  # 未安装nvidia-ml-py时回退到nvidia-smi命令
+    pynvml = None
+
+
+# docker stats的输出格式，字段之间以|分隔，避免字段内部的空格（如"975.7MiB / 250.3GiB"）影响解析
+STATS_FORMAT = "{{.Name}}|{{.CPUPerc}}|{{.MemUsage}}|{{.MemPerc}}|{{.NetIO}}|{{.BlockIO}}|{{.PIDs}}"
+
+# docker stats --format '{{json .}}'输出中与ContainerStats字段一一对应的键
+STATS_JSON_KEYS = ("Name", "CPUPerc", "MemUsage", "MemPerc", "NetIO", "BlockIO", "PIDs")
+
+# docker stats在刷新屏幕时输出的ANSI控制序列
+ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+# wemol任务容器名称: wemol_rc_task[_{类型}]_{task_id}_{job_id}[_{数字}]
+# 类型对应task.json所在的Worker目录，缺省时按ALL处理
+CONTAINER_NAME_RE = re.compile(
+    r"wemol_rc_task(?:_([A-Za-z][A-Za-z0-9]*))?_(\d+)_(\d+)(?:_\d+)?"
+)
+
+# 模块名称中不适合做文件夹名的字符，以及连续空白
+SANITIZE_BAD_RE = re.compile(r'[<>:"/\\|?*]')
+SANITIZE_WS_RE = re.compile(r"\s+")
+
+# cgroup文件系统挂载点
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# Docker Engine API的Unix socket路径
+DOCKER_SOCKET = "/var/run/docker.sock"
+
+# nvidia-smi --query-gpu一次查询的全部字段，供UUID映射、GPU详细信息和利用率共用
+GPU_QUERY_FIELDS = (
+    "index",
+    "uuid",
+    "name",
+    "memory.total",
+    "memory.used",
+    "utilization.gpu",
+    "utilization.memory",
+    "temperature.gpu",
+    "fan.speed",
+    "power.draw",
+    "power.limit",
+)
+
+# 每轮都会执行的nvidia-smi命令参数（不含可执行文件路径）
+NVIDIA_SMI_GPU_QUERY_ARGS = (
+    "--query-gpu=" + ",".join(GPU_QUERY_FIELDS),
+    "--format=csv,noheader,nounits",
+)
+NVIDIA_SMI_APPS_ARGS = (
+    "--query-compute-apps=pid,gpu_uuid,used_memory",
+    "--format=csv,noheader,nounits",
+)
+NVIDIA_SMI_PMON_ARGS = ("pmon", "-c", "1", "-s", "um")
+
+
+def loads_json(data: bytes):
+    """解析UTF-8编码的JSON字节串，安装了orjson时使用orjson，解析失败抛出json.JSONDecodeError"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def format_binary_size(size: float) -> str:
+    """按docker stats的内存格式（1024进制，4位有效数字）格式化字节数，如975.7MiB"""
+    units = ["B", "KiB", "MiB", "GiB", "TiB", "PiB"]
+    i = 0
+    while size >= 1024 and i < len(units) - 1:
+        size /= 1024.0
+        i += 1
+    return "%.4g%s" % (size, units[i])
+
+
+def format_decimal_size(size: float) -> str:
+    """按docker stats的IO格式（1000进制，3位有效数字）格式化字节数，如1.58MB"""
+    units = ["B", "kB", "MB", "GB", "TB", "PB"]
+    i = 0
+    while size >= 1000 and i < len(units) - 1:
+        size /= 1000.0
+        i += 1
+    return "%.3g%s" % (size, units[i])
+
+
+class ContainerStats(NamedTuple):
+    """单个容器一次采样的资源使用统计信息，字段格式与docker stats的输出一致"""
+
+    container: str
+    cpu_percent: str
+    mem_usage: str
+    mem_percent: str
+    net_io: str
+    block_io: str
+    pids: str
+
+
+class ContainerGPUInfo(NamedTuple):
+    """单个容器使用的GPU汇总信息，使用多块GPU时各字段以逗号分隔"""
+
+    gpu_count: str
+    gpu_ids: str
+    gpu_names: str
+    gpu_memory_used: str
+    gpu_memory_total: str
+    gpu_utilization: str
+    gpu_memory_utilization: str
+    gpu_temperature: str
+    gpu_fan_speed: str
+    gpu_power_draw: str
+    gpu_power_limit: str
+
+
+class GPUSample(NamedTuple):
+    """单块GPU的利用率采样（百分比），显存利用率不支持时为None"""
+
+    gpu_util: int
+    mem_util: Optional[int]
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """通过Unix socket通信的HTTP连接"""
+
+    def __init__(self, socket_path: str, timeout: float = 10):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class DockerAPIError(http.client.HTTPException):
+    """Docker Engine API返回了非200状态码"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class DockerAPIClient:
+    """
+    Docker Engine API客户端
+
+    维护一个Unix socket上的HTTP长连接池，避免每次调用都启动docker CLI子进程；
+    多个线程可以同时发送请求，各自使用池中的空闲连接
+    """
+
+    def __init__(
+        self, socket_path: str = DOCKER_SOCKET, timeout: float = 10, maxsize: int = 8
+    ):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.maxsize = maxsize  # 最多保留的空闲连接数
+        self._idle: List[UnixHTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> UnixHTTPConnection:
+        """从连接池取出一个空闲连接，没有空闲连接时新建"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return UnixHTTPConnection(self.socket_path, self.timeout)
+
+    def _release(self, conn: UnixHTTPConnection):
+        """将连接放回连接池，空闲连接已满时关闭"""
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def get(self, path: str):
+        """
+        发送GET请求并解析JSON响应
+
+        连接被dockerd关闭时会丢弃所有空闲连接并用新连接重试一次
+
+        Args:
+            path: API路径（如/containers/json）
+
+        Returns:
+            解析后的JSON数据
+
+        Raises:
+            OSError: socket通信失败
+            DockerAPIError: 响应状态码非200
+            http.client.HTTPException: HTTP协议错误
+        """
+        for attempt in range(2):
+            conn = self._acquire()
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                self.close()
+                if attempt:
+                    raise
+                continue
+
+            self._release(conn)
+            if response.status != 200:
+                raise DockerAPIError(
+                    response.status,
+                    f"{path} 返回状态码 {response.status}: {body[:200]!r}",
+                )
+            return loads_json(body)
+
+    def close(self):
+        """关闭所有空闲连接"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
 
 
 class WemolResourceRecorder:
     """Wemol资源监控记录器"""
 
+    # CSV列：资源统计字段和GPU字段分别与ContainerStats、ContainerGPUInfo的字段一致
+    _STATS_FIELDS = ContainerStats._fields
+    _GPU_FIELDS = ContainerGPUInfo._fields
+    _FIELDNAMES = ("task_id", "job_id", "module_name", "timestamp") + (
+        _STATS_FIELDS + _GPU_FIELDS
+    )
+
+    # 每个任务累积多少行后批量写入CSV文件
+    _FLUSH_EVERY = 16
+    # 缓冲中最早的一行超过该时间（秒）未写入时也会立即写入
+    _FLUSH_MAX_DELAY = 60
+    # CSV写入队列的最大长度，写入线程跟不上时监控循环在入队处等待
+    _WRITE_QUEUE_SIZE = 4096
+    # 并行等待Docker API、task.json读取等I/O的线程数，与DockerAPIClient的空闲连接数一致
+    _POOL_WORKERS = 8
+    # nvidia-smi连续失败多少次后暂停GPU监控，以及暂停后多久（秒）重新检测GPU
+    _GPU_MAX_FAILURES = 3
+    _GPU_REPROBE_DELAY = 600
+
     def __init__(self, interval: int = 5, log_level: str = "INFO"):
         """
         初始化监控记录器
@@ -28,11 +281,115 @@ class WemolResourceRecorder:
         Args:
             interval: 监控间隔时间（秒），默认5秒
             log_level: 日志级别，默认INFO
+
+        Raises:
+            ValueError: 监控间隔不大于0
         """
+        if interval <= 0:
+            raise ValueError(f"监控间隔必须大于0: {interval}")
         self.interval = interval
         self.setup_logging(log_level)
         self.csv_files: Dict[str, str] = {}  # task_id -> csv_file_path
         self.module_names: Dict[str, str] = {}  # task_id -> module_name
+        self._task_worker_types: Dict[str, str] = {}  # task_id -> Worker类型
+        # task_id -> (打开的CSV文件, csv.writer)，跨监控周期复用，依靠文件缓冲批量落盘
+        self._csv_handles: Dict[str, Tuple[IO, Any]] = {}
+        # task_id -> 尚未写入的记录行，以及缓冲中第一行的加入时间（time.monotonic()）
+        self._row_buffers: Dict[str, List[Tuple]] = {}
+        self._row_buffer_since: Dict[str, float] = {}
+        # CSV相关的状态只在写入线程中访问，监控循环通过队列提交(函数, 参数)，None表示停止
+        self._write_q: queue.Queue = queue.Queue(maxsize=self._WRITE_QUEUE_SIZE)
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="csv-writer", daemon=True
+        )
+        self._writer_thread.start()
+        atexit.register(self._close_writer)
+
+        # 常驻docker stats进程推送的最新统计数据: container_name -> (time.monotonic()接收时间, stats)
+        # 仅在本机无法直读cgroup时才启动该进程，避免dockerd持续计算统计信息
+        self._stats_cache: Dict[str, Tuple[float, ContainerStats]] = {}
+        self._stats_lock = threading.Lock()
+        self._stats_proc: Optional[subprocess.Popen] = None
+        self._stats_stop = threading.Event()
+        self._stats_thread: Optional[threading.Thread] = None
+
+        # cgroup直读相关状态
+        self._cgroup_v2 = os.path.exists(
+            os.path.join(CGROUP_ROOT, "cgroup.controllers")
+        )
+        # (container_id, 控制器) -> 目录
+        self._cgroup_dirs: Dict[Tuple[str, str], str] = {}
+        # container_id -> (time.monotonic()时间, CPU纳秒)
+        self._cpu_samples: Dict[str, Tuple[float, int]] = {}
+        # 是否已经成功直读过任一容器的cgroup，一旦成功就不再启动常驻docker stats进程
+        self._cgroup_usable = False
+        self._host_mem_total: Optional[int] = None
+
+        # nvidia-smi的路径只解析一次，命令参数预先拼好，避免每次调用都搜索PATH
+        self._smi_path = shutil.which("nvidia-smi") or "nvidia-smi"
+        self._smi_gpu_argv = (self._smi_path,) + NVIDIA_SMI_GPU_QUERY_ARGS
+        self._smi_apps_argv = (self._smi_path,) + NVIDIA_SMI_APPS_ARGS
+        self._smi_pmon_argv = (self._smi_path,) + NVIDIA_SMI_PMON_ARGS
+
+        # NVML初始化，不可用时回退到nvidia-smi命令
+        # GPU拓扑在运行期间不变，设备句柄只获取一次
+        self._nvml = False
+        self._nvml_handles: List[Any] = []
+        # 每块GPU上一次读取到的利用率采样时间戳（微秒），下一次只取之后的采样
+        self._last_sample_ts: Dict[int, int] = {}
+        if pynvml is not None:
+            try:
+                pynvml.nvmlInit()
+                self._nvml = True
+                self._nvml_handles = [
+                    pynvml.nvmlDeviceGetHandleByIndex(index)
+                    for index in range(pynvml.nvmlDeviceGetCount())
+                ]
+                self.logger.info(
+                    f"使用NVML获取GPU信息，共 {len(self._nvml_handles)} 块GPU"
+                )
+                # 进程生命周期内只初始化一次，退出时统一关闭
+                atexit.register(self._shutdown_nvml)
+            except Exception as e:
+                self.logger.debug("NVML初始化失败，使用nvidia-smi获取GPU信息: %s", e)
+                self._shutdown_nvml()
+
+        # 本轮nvidia-smi --query-gpu的查询结果，每轮监控开始时清空
+        self._gpu_sample: Optional[Dict[str, Dict[str, str]]] = None
+
+        # 启动时检测一次GPU，没有GPU的主机上不再每轮调用nvidia-smi
+        self._gpu_failures = 0
+        self._gpu_reprobe_at = 0.0  # time.monotonic()时间
+        self._gpu_available = self._probe_gpu()
+        if self._gpu_available:
+            self._check_persistence_mode()
+        else:
+            self._gpu_reprobe_at = time.monotonic() + self._GPU_REPROBE_DELAY
+            self.logger.info(
+                f"未检测到可用的NVIDIA GPU，跳过GPU监控，{self._GPU_REPROBE_DELAY}秒后重新检测"
+            )
+
+        # 常驻nvidia-smi -lms进程推送的每块GPU最新一行: gpu_id -> deque[(time.monotonic()接收时间, 字段)]
+        # 仅在NVML不可用时才启动，避免每轮重复初始化驱动
+        self._gpu_latest: Dict[str, deque] = {}
+        self._smi_proc: Optional[subprocess.Popen] = None
+        self._smi_stop = threading.Event()
+        self._smi_thread: Optional[threading.Thread] = None
+
+        # 容器列表缓存，容器变化以分钟计，无需每轮都查询一次
+        self._containers_cache: List[Dict[str, str]] = []
+        self._containers_cache_expiry = 0.0  # time.monotonic()时间
+
+        # 上一次拼接的GPU功率上限字符串，功率上限基本不变，可直接复用
+        self._power_limits_cache: Tuple[Tuple[str, ...], str] = ((), "N/A")
+
+        # 整个运行期间共用的线程池，避免每轮监控重复创建和销毁线程
+        self._pool = ThreadPoolExecutor(max_workers=self._POOL_WORKERS)
+
+        # Docker Engine API客户端，socket不存在时回退到docker CLI
+        self._docker: Optional[DockerAPIClient] = None
+        if os.path.exists(DOCKER_SOCKET):
+            self._docker = DockerAPIClient(DOCKER_SOCKET)
 
     def setup_logging(self, level: str):
         """设置日志配置"""
@@ -46,103 +403,134 @@ class WemolResourceRecorder:
         )
         self.logger = logging.getLogger(__name__)
 
-    def get_wemol_containers(self) -> List[Dict[str, str]]:
+    def list_running_containers(
+        self, name_filter: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
         """
-        获取所有wemol_rc_task前缀的容器信息
+        获取所有运行中容器的ID和名称
+
+        优先通过Docker Engine API获取，API不可用时回退到docker ps命令
+
+        Args:
+            name_filter: 只返回名称包含该字符串的容器，由dockerd在服务端过滤
 
         Returns:
-            包含容器信息的字典列表，每个字典包含container_id, name, task_id, job_id
+            (完整容器ID, 容器名称) 列表
+
+        Raises:
+            subprocess.CalledProcessError: docker ps命令执行失败
         """
-        try:
-            # 执行docker ps命令获取容器信息，使用简单格式避免表格对齐问题
-            result = subprocess.run(
-                ["docker", "ps", "--format", "{{.ID}} {{.Names}}"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                check=True,
-            )
+        if self._docker is not None:
+            try:
+                path = "/containers/json"
+                if name_filter:
+                    filters = json.dumps({"name": [name_filter]})
+                    path += "?filters=" + quote(filters, safe="")
+                containers = []
+                for item in self._docker.get(path):
+                    names = item.get("Names") or []
+                    if names:
+                        containers.append((item["Id"], names[0].lstrip("/")))
+                self.logger.debug("Docker API 容器列表: %s", containers)
+                return containers
+            except Exception as e:
+                self.logger.warning(
+                    f"通过Docker API获取容器列表失败，回退到docker ps: {e}"
+                )
 
-            self.logger.debug(f"Docker ps 原始输出:\n{result.stdout}")
+        # 执行docker ps命令获取容器信息，使用简单格式避免表格对齐问题
+        argv = ["docker", "ps", "--no-trunc", "--format", "{{.ID}}|{{.Names}}"]
+        if name_filter:
+            argv += ["--filter", f"name={name_filter}"]
+        result = subprocess.run(
+            argv,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
 
-            containers = []
-            lines = result.stdout.strip().split("\n")
+        self.logger.debug("Docker ps 原始输出:\n%s", result.stdout)
 
-            self.logger.debug(f"处理的行数: {len(lines)}")
+        containers = []
+        lines = result.stdout.strip().split("\n")
 
-            for i, line in enumerate(lines):
-                self.logger.debug(f"处理第{i+1}行: '{line}'")
+        self.logger.debug("处理的行数: %s", len(lines))
 
-                if not line.strip():
-                    self.logger.debug(f"跳过空行")
-                    continue
+        # 逐行调试日志只在DEBUG级别下输出，避免每行都调用一次logger
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        for i, line in enumerate(lines):
+            if debug:
+                self.logger.debug("处理第%s行: '%s'", i + 1, line)
 
-                # 使用空格分割，限制为2部分（容器ID和容器名）
-                parts = line.strip().split(" ", 1)
-                self.logger.debug(f"分割后的部分: {parts}")
+            if not line.strip():
+                continue
 
-                if len(parts) >= 2:
-                    container_id = parts[0]
-                    container_name = parts[1]
-                    self.logger.debug(
-                        f"容器ID: '{container_id}', 容器名: '{container_name}'"
-                    )
+            # 使用|分割，限制为2部分（容器ID和容器名）
+            parts = line.strip().split("|", 1)
 
-                    # 检查是否是wemol_rc_task前缀的容器
-                    if container_name.startswith("wemol_rc_task"):
-                        self.logger.debug(f"找到wemol_rc_task容器: {container_name}")
+            if len(parts) >= 2:
+                containers.append((parts[0], parts[1]))
+            elif debug:
+                self.logger.debug("行分割后部分数量不足: %s", parts)
 
-                        # 解析容器名称中的数字: wemol_rc_task_gpu_132178_182060_334177
-                        # 如果容器名称是: wemol_rc_task_132178_182060_334177
-                        # 则后续判断都按 wemol_rc_task_all 处理
-                        # 只关注前两个数字：task_id 和 job_id
-                        pattern = r"wemol_rc_task_\w+_(\d+)_(\d+)_\d+"
-                        match = re.match(pattern, container_name)
+        return containers
 
-                        self.logger.debug(f"正则匹配结果: {match}")
+    def get_wemol_containers(self) -> List[Dict[str, str]]:
+        """
+        获取所有wemol_rc_task前缀的容器信息
 
-                        if match:
-                            task_id = match.group(1)  # 第一个数字作为task_id
-                            job_id = match.group(2)  # 第二个数字作为job_id
+        Returns:
+            包含容器信息的字典列表，每个字典包含container_id, name, task_id, job_id,
+            worker_type
+        """
+        try:
+            containers = []
 
-                            self.logger.debug(
-                                f"解析得到 task_id: {task_id}, job_id: {job_id}"
-                            )
+            # 只让dockerd返回名称包含wemol_rc_task的容器，节点上其他容器不再传输和解析
+            for container_id, container_name in self.list_running_containers(
+                "wemol_rc_task"
+            ):
+                self.logger.debug(
+                    "容器ID: '%s', 容器名: '%s'", container_id, container_name
+                )
 
-                            containers.append(
-                                {
-                                    "container_id": container_id,
-                                    "name": container_name,
-                                    "task_id": task_id,
-                                    "job_id": job_id,
-                                }
-                            )
-                        elif container_name.startswith("wemol_rc_task"):
-                            task_id = container_name.split("_")[3]
-                            job_id = container_name.split("_")[4]
+                # 解析容器名称中的数字: wemol_rc_task_gpu_132178_182060_334177
+                # 如果容器名称是: wemol_rc_task_132178_182060_334177
+                # 则后续判断都按 wemol_rc_task_all 处理
+                # 只关注前两个数字：task_id 和 job_id
+                match = CONTAINER_NAME_RE.match(container_name)
 
-                            self.logger.debug(
-                                f"解析得到 task_id: {task_id}, job_id: {job_id}"
-                            )
+                if match:
+                    worker_type = (match.group(1) or "all").upper()
+                    task_id = match.group(2)  # 第一个数字作为task_id
+                    job_id = match.group(3)  # 第二个数字作为job_id
 
-                            containers.append(
-                                {
-                                    "container_id": container_id,
-                                    "name": container_name,
-                                    "task_id": task_id,
-                                    "job_id": job_id,
-                                }
-                            )
-                        else:
-                            self.logger.warning(
-                                f"容器名称 {container_name} 不匹配预期格式"
-                            )
-                    else:
-                        self.logger.debug(f"跳过非wemol_rc_task容器: {container_name}")
+                    self.logger.debug(
+                        "找到wemol_rc_task容器: %s, task_id: %s, job_id: %s",
+                        container_name,
+                        task_id,
+                        job_id,
+                    )
+
+                    containers.append(
+                        {
+                            "container_id": container_id,
+                            "name": container_name,
+                            "task_id": task_id,
+                            "job_id": job_id,
+                            "worker_type": worker_type,
+                        }
+                    )
+                elif container_name.startswith("wemol_rc_task"):
+                    self.logger.warning(f"容器名称 {container_name} 不匹配预期格式")
                 else:
-                    self.logger.debug(f"行分割后部分数量不足: {len(parts)}")
+                    self.logger.debug("跳过非wemol_rc_task容器: %s", container_name)
 
             self.logger.info(f"找到 {len(containers)} 个wemol_rc_task容器")
+            self._prefetch_module_names(
+                {c["task_id"]: c["worker_type"] for c in containers}
+            )
             return containers
 
         except subprocess.CalledProcessError as e:
@@ -152,12 +540,33 @@ class WemolResourceRecorder:
             self.logger.error(f"获取容器信息时出错: {e}")
             return []
 
-    def get_task_info(self, task_id: str) -> Optional[Dict]:
+    def _prefetch_module_names(self, task_worker_types: Dict[str, str]):
+        """
+        并行读取尚未缓存模块名称的任务的task.json，预先填充module_names
+
+        Args:
+            task_worker_types: task_id到Worker类型的映射
+        """
+        missing = [
+            (task_id, worker_type)
+            for task_id, worker_type in task_worker_types.items()
+            if task_id not in self.module_names
+        ]
+        if len(missing) <= 1:
+            # 单个任务无需线程池，留给setup_csv_file按需读取
+            return
+
+        list(self._pool.map(lambda item: self.get_module_name(*item), missing))
+
+    def get_task_info(
+        self, task_id: str, worker_type: Optional[str] = None
+    ) -> Optional[Dict]:
         """
         从task.json文件中读取任务信息
 
         Args:
             task_id: 任务ID（例如132178）
+            worker_type: 从容器名称解析出的Worker类型（例如GPU），优先尝试该目录
 
         Returns:
             任务信息字典，如果读取失败返回None
@@ -173,18 +582,23 @@ class WemolResourceRecorder:
             last_two = task_id[-2:]  # 倒数两位
             second_last_two = task_id[-4:-2]  # 倒数四位的前两位
 
-            # 尝试不同的Worker类型
+            # 尝试不同的Worker类型，已知类型排在最前面，通常一次stat即可命中
             worker_types = ["GPU", "CPU", "AF2", "ALL"]
+            known_type = self._task_worker_types.get(task_id, worker_type)
+            if known_type:
+                worker_types = [known_type] + [
+                    t for t in worker_types if t != known_type
+                ]
 
-            for worker_type in worker_types:
-                task_file_path = f"/data/PRG/RCall/Worker.{worker_type}/work_blob/{second_last_two}/{last_two}/{task_id}/task.json"
+            for candidate in worker_types:
+                task_file_path = f"/data/PRG/RCall/Worker.{candidate}/work_blob/{second_last_two}/{last_two}/{task_id}/task.json"
 
                 if os.path.exists(task_file_path):
+                    self._task_worker_types[task_id] = candidate
                     self.logger.info(f"找到任务文件: {task_file_path}")
 
-                    with open(task_file_path, "r", encoding="utf-8") as f:
-                        task_data = json.load(f)
-                        return task_data
+                    with open(task_file_path, "rb") as f:
+                        return loads_json(f.read())
 
             self.logger.warning(f"未找到任务ID {task_id} 对应的task.json文件")
             return None
@@ -196,12 +610,13 @@ class WemolResourceRecorder:
             self.logger.error(f"读取任务信息时出错: {e}")
             return None
 
-    def get_module_name(self, task_id: str) -> str:
+    def get_module_name(self, task_id: str, worker_type: Optional[str] = None) -> str:
         """
         获取模块名称，如果已缓存则直接返回，否则从task.json读取
 
         Args:
             task_id: 任务ID
+            worker_type: Worker类型，可选
 
         Returns:
             模块名称，如果获取失败返回"Unknown"
@@ -209,7 +624,7 @@ class WemolResourceRecorder:
         if task_id in self.module_names:
             return self.module_names[task_id]
 
-        task_info = self.get_task_info(task_id)
+        task_info = self.get_task_info(task_id, worker_type)
         if task_info and "Module" in task_info and "Name" in task_info["Module"]:
             module_name = task_info["Module"]["Name"]
             self.module_names[task_id] = module_name
@@ -219,94 +634,715 @@ class WemolResourceRecorder:
             self.logger.warning(f"无法获取任务 {task_id} 的模块名称")
             return "Unknown"
 
-    def get_container_stats(self, container_name: str) -> Optional[Dict]:
+    def _find_cgroup_dir(self, container_id: str, controller: str) -> Optional[str]:
+        """
+        查找容器对应的cgroup目录，兼容cgroup v1/v2以及systemd/cgroupfs两种驱动
+
+        Args:
+            container_id: 完整容器ID
+            controller: cgroup v1控制器名称（如memory、cpuacct），cgroup v2下忽略
+
+        Returns:
+            cgroup目录路径，不存在时返回None
+        """
+        key = (container_id, "" if self._cgroup_v2 else controller)
+        cached = self._cgroup_dirs.get(key)
+        if cached:
+            return cached
+
+        base = CGROUP_ROOT if self._cgroup_v2 else os.path.join(CGROUP_ROOT, controller)
+        for candidate in (
+            os.path.join(base, "system.slice", f"docker-{container_id}.scope"),
+            os.path.join(base, "docker", container_id),
+        ):
+            if os.path.isdir(candidate):
+                self._cgroup_dirs[key] = candidate
+                return candidate
+        return None
+
+    def _read_cgroup_file(
+        self, container_id: str, controller: str, filename: str
+    ) -> Optional[str]:
+        """读取容器cgroup目录下的文件内容，文件不存在时返回None"""
+        cgroup_dir = self._find_cgroup_dir(container_id, controller)
+        if not cgroup_dir:
+            return None
+        try:
+            with open(os.path.join(cgroup_dir, filename), "r") as f:
+                return f.read()
+        except FileNotFoundError:
+            # 容器退出后cgroup目录被删除，丢弃缓存的目录；目录仍在时只是该文件不存在
+            if not os.path.isdir(cgroup_dir):
+                self._cgroup_dirs.pop(
+                    (container_id, "" if self._cgroup_v2 else controller), None
+                )
+            return None
+        except (IOError, OSError):
+            return None
+
+    def _get_host_mem_total(self) -> int:
+        """获取宿主机内存总量（字节），用于容器未设置内存限制的情况"""
+        if self._host_mem_total is None:
+            self._host_mem_total = 0
+            try:
+                with open("/proc/meminfo", "r") as f:
+                    for line in f:
+                        if line.startswith("MemTotal:"):
+                            self._host_mem_total = int(line.split()[1]) * 1024
+                            break
+            except (IOError, OSError, ValueError):
+                pass
+        return self._host_mem_total
+
+    def _compute_cpu_percent(self, container_id: str, cpu_usage: int) -> str:
+        """
+        根据与上一次采样的CPU累计时间差计算CPU使用率（以单核为100%）
+
+        Args:
+            container_id: 完整容器ID
+            cpu_usage: 容器CPU累计使用时间（纳秒）
+
+        Returns:
+            格式化后的CPU使用率，首次采样返回N/A
+        """
+        now = time.monotonic()
+        previous = self._cpu_samples.get(container_id)
+        self._cpu_samples[container_id] = (now, cpu_usage)
+        if previous and now > previous[0] and cpu_usage >= previous[1]:
+            return "%.2f%%" % (
+                (cpu_usage - previous[1]) / 1e9 / (now - previous[0]) * 100.0
+            )
+        return "N/A"
+
+    def _read_cgroup_stats(
+        self, container_id: str, container_name: str
+    ) -> Optional[ContainerStats]:
         """
-        获取容器的资源使用统计信息
+        直接读取cgroup文件获取容器的资源使用统计信息，输出格式与docker stats保持一致
+
+        CPU使用率通过与上一次采样的CPU时间差值除以经过的时间计算，与docker stats一样
+        以单核为100%；首次采样没有参考值，CPU使用率记为N/A
 
         Args:
+            container_id: 完整容器ID
             container_name: 容器名称
 
         Returns:
-            包含资源统计信息的字典，如果获取失败返回None
+            资源统计信息（不含timestamp），cgroup文件不存在时返回None
         """
+        # CPU累计使用时间（纳秒）
+        if self._cgroup_v2:
+            cpu_stat = self._read_cgroup_file(container_id, "", "cpu.stat")
+            if cpu_stat is None:
+                return None
+            cpu_usage = None
+            for line in cpu_stat.splitlines():
+                if line.startswith("usage_usec "):
+                    cpu_usage = int(line.split()[1]) * 1000
+                    break
+            if cpu_usage is None:
+                return None
+        else:
+            cpuacct = self._read_cgroup_file(container_id, "cpuacct", "cpuacct.usage")
+            if cpuacct is None:
+                return None
+            cpu_usage = int(cpuacct.strip())
+
+        cpu_percent = self._compute_cpu_percent(container_id, cpu_usage)
+
+        # 内存使用量，与docker一致扣除inactive_file缓存
+        if self._cgroup_v2:
+            usage_text = self._read_cgroup_file(container_id, "", "memory.current")
+            limit_text = self._read_cgroup_file(container_id, "", "memory.max")
+            stat_text = self._read_cgroup_file(container_id, "", "memory.stat")
+            inactive_key = "inactive_file"
+        else:
+            usage_text = self._read_cgroup_file(
+                container_id, "memory", "memory.usage_in_bytes"
+            )
+            limit_text = self._read_cgroup_file(
+                container_id, "memory", "memory.limit_in_bytes"
+            )
+            stat_text = self._read_cgroup_file(container_id, "memory", "memory.stat")
+            inactive_key = "total_inactive_file"
+        if usage_text is None:
+            return None
+
+        mem_usage = int(usage_text.strip())
+        for line in (stat_text or "").splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[0] == inactive_key:
+                mem_usage = max(0, mem_usage - int(parts[1]))
+                break
+
+        host_mem_total = self._get_host_mem_total()
+        limit_text = (limit_text or "max").strip()
+        mem_limit = host_mem_total if limit_text == "max" else int(limit_text)
+        # cgroup v1未设置限制时为一个极大值，按宿主机内存总量计算
+        if host_mem_total and mem_limit > host_mem_total:
+            mem_limit = host_mem_total
+        mem_percent = "%.2f%%" % (mem_usage * 100.0 / mem_limit) if mem_limit else "N/A"
+
+        # 块IO读写字节数
+        block_read = block_write = 0
+        if self._cgroup_v2:
+            for line in (
+                self._read_cgroup_file(container_id, "", "io.stat") or ""
+            ).splitlines():
+                for field in line.split()[1:]:
+                    key, _, value = field.partition("=")
+                    if key == "rbytes":
+                        block_read += int(value)
+                    elif key == "wbytes":
+                        block_write += int(value)
+        else:
+            blkio = self._read_cgroup_file(
+                container_id, "blkio", "blkio.throttle.io_service_bytes"
+            )
+            for line in (blkio or "").splitlines():
+                parts = line.split()
+                if len(parts) == 3 and parts[1] == "Read":
+                    block_read += int(parts[2])
+                elif len(parts) == 3 and parts[1] == "Write":
+                    block_write += int(parts[2])
+
+        # 进程（线程）数
+        pids_text = self._read_cgroup_file(
+            container_id, "" if self._cgroup_v2 else "pids", "pids.current"
+        )
+        pids = pids_text.strip() if pids_text else "N/A"
+
+        # 网络IO，通过容器内任一进程读取其网络命名空间的/proc/<pid>/net/dev
+        net_io = "N/A"
+        procs = self._read_cgroup_file(
+            container_id, "" if self._cgroup_v2 else "memory", "cgroup.procs"
+        )
+        first_pid = procs.split()[0] if procs and procs.split() else None
+        if first_pid:
+            try:
+                rx_bytes = tx_bytes = 0
+                with open(f"/proc/{first_pid}/net/dev", "r") as f:
+                    for line in f.readlines()[2:]:
+                        interface, _, data = line.partition(":")
+                        if interface.strip() == "lo":
+                            continue
+                        fields = data.split()
+                        rx_bytes += int(fields[0])
+                        tx_bytes += int(fields[8])
+                net_io = (
+                    f"{format_decimal_size(rx_bytes)} / {format_decimal_size(tx_bytes)}"
+                )
+            except (IOError, OSError, ValueError, IndexError):
+                pass
+
+        return ContainerStats(
+            container=container_name,
+            cpu_percent=cpu_percent,
+            mem_usage=f"{format_binary_size(mem_usage)} / {format_binary_size(mem_limit)}",
+            mem_percent=mem_percent,
+            net_io=net_io,
+            block_io=f"{format_decimal_size(block_read)} / {format_decimal_size(block_write)}",
+            pids=pids,
+        )
+
+    def get_cgroup_container_stats(
+        self, containers: List[Dict]
+    ) -> Tuple[Dict[str, ContainerStats], List[str]]:
+        """
+        通过cgroup文件直接获取多个容器的资源使用统计信息
+
+        Args:
+            containers: 容器信息列表（需包含container_id和name）
+
+        Returns:
+            (容器名称到资源统计信息的映射, cgroup目录已被删除的容器名称列表)，
+            cgroup不可用的容器不在映射中
+        """
+        # 之前读取成功过的容器，cgroup目录消失说明容器已经退出
+        known_ids = {key[0] for key in self._cgroup_dirs}
+        stats_map = {}
+        gone = []
+        for container in containers:
+            try:
+                stats = self._read_cgroup_stats(
+                    container["container_id"], container["name"]
+                )
+            except Exception as e:
+                self.logger.debug(
+                    "读取容器 %s 的cgroup数据失败: %s", container["name"], e
+                )
+                stats = None
+            if stats:
+                stats_map[container["name"]] = stats
+            elif (
+                container["container_id"] in known_ids
+                and self._find_cgroup_dir(container["container_id"], "cpuacct") is None
+            ):
+                self.logger.debug("容器 %s 的cgroup目录已删除", container["name"])
+                gone.append(container["name"])
+        return stats_map, gone
+
+    def _read_api_stats(
+        self, container_id: str, container_name: str
+    ) -> Optional[ContainerStats]:
+        """
+        通过Docker Engine API获取容器的资源使用统计信息，输出格式与docker stats保持一致
+
+        使用one-shot模式避免dockerd等待第二次采样，CPU使用率与cgroup方式一样
+        由相邻两次调用的CPU累计时间差计算
+
+        Args:
+            container_id: 完整容器ID
+            container_name: 容器名称
+
+        Returns:
+            资源统计信息（不含timestamp），获取失败时返回None
+        """
+        if self._docker is None:
+            return None
+
+        data = self._docker.get(
+            f"/containers/{quote(container_id)}/stats?stream=false&one-shot=true"
+        )
+
+        cpu_usage = data.get("cpu_stats", {}).get("cpu_usage", {}).get("total_usage")
+        if cpu_usage is None:
+            return None
+        cpu_percent = self._compute_cpu_percent(container_id, int(cpu_usage))
+
+        memory_stats = data.get("memory_stats", {})
+        mem_usage = memory_stats.get("usage", 0)
+        mem_detail = memory_stats.get("stats", {})
+        # 与docker一致扣除inactive_file缓存（cgroup v1为total_inactive_file）
+        inactive = mem_detail.get(
+            "total_inactive_file", mem_detail.get("inactive_file", 0)
+        )
+        mem_usage = max(0, mem_usage - inactive)
+        mem_limit = memory_stats.get("limit", 0)
+        mem_percent = "%.2f%%" % (mem_usage * 100.0 / mem_limit) if mem_limit else "N/A"
+
+        rx_bytes = tx_bytes = 0
+        for network in (data.get("networks") or {}).values():
+            rx_bytes += network.get("rx_bytes", 0)
+            tx_bytes += network.get("tx_bytes", 0)
+
+        block_read = block_write = 0
+        for entry in (data.get("blkio_stats") or {}).get(
+            "io_service_bytes_recursive"
+        ) or []:
+            op = entry.get("op", "").lower()
+            if op == "read":
+                block_read += entry.get("value", 0)
+            elif op == "write":
+                block_write += entry.get("value", 0)
+
+        pids = (data.get("pids_stats") or {}).get("current")
+
+        return ContainerStats(
+            container=container_name,
+            cpu_percent=cpu_percent,
+            mem_usage=f"{format_binary_size(mem_usage)} / {format_binary_size(mem_limit)}",
+            mem_percent=mem_percent,
+            net_io=f"{format_decimal_size(rx_bytes)} / {format_decimal_size(tx_bytes)}",
+            block_io=f"{format_decimal_size(block_read)} / {format_decimal_size(block_write)}",
+            pids=str(pids) if pids is not None else "N/A",
+        )
+
+    def get_api_container_stats(
+        self, containers: List[Dict]
+    ) -> Tuple[Dict[str, ContainerStats], List[str]]:
+        """
+        通过Docker Engine API获取多个容器的资源使用统计信息
+
+        Args:
+            containers: 容器信息列表（需包含container_id和name）
+
+        Returns:
+            (容器名称到资源统计信息的映射, dockerd报告不存在的容器名称列表)，
+            获取失败的容器不在映射中
+        """
+        if self._docker is None:
+            return {}, []
+
+        def read_one(container: Dict) -> Tuple[Optional[ContainerStats], bool]:
+            try:
+                return (
+                    self._read_api_stats(container["container_id"], container["name"]),
+                    False,
+                )
+            except DockerAPIError as e:
+                if e.status == 404:
+                    self.logger.debug("容器 %s 已不存在", container["name"])
+                    return None, True
+                self.logger.debug(
+                    "通过Docker API获取容器 %s 统计信息失败: %s", container["name"], e
+                )
+                return None, False
+            except Exception as e:
+                self.logger.debug(
+                    "通过Docker API获取容器 %s 统计信息失败: %s", container["name"], e
+                )
+                return None, False
+
+        # 每个容器一次HTTP请求，使用线程池并行等待dockerd响应
+        if len(containers) > 1:
+            results = list(self._pool.map(read_one, containers))
+        else:
+            results = [read_one(container) for container in containers]
+
+        stats_map = {}
+        gone = []
+        for container, (stats, missing) in zip(containers, results):
+            if stats:
+                stats_map[container["name"]] = stats
+            elif missing:
+                gone.append(container["name"])
+        return stats_map, gone
+
+    def collect_container_stats(
+        self, containers: List[Dict]
+    ) -> Tuple[Dict[str, ContainerStats], List[str]]:
+        """
+        获取本轮所有容器的资源使用统计信息
+
+        依次尝试：cgroup文件直读 -> Docker Engine API -> 常驻docker stats进程缓存
+        -> 一次批量docker stats调用，每一步只处理前面步骤未能获取的容器；
+        cgroup目录已删除或Docker API报告不存在的容器视为已退出，不再继续尝试；
+        本机可以直读cgroup时不启动常驻docker stats进程
+
+        Args:
+            containers: 容器信息列表
+
+        Returns:
+            (容器名称到资源统计信息的映射, 已退出的容器名称列表)
+        """
+        # 清理已退出容器的缓存
+        active_ids = {container["container_id"] for container in containers}
+        for container_id in list(self._cpu_samples):
+            if container_id not in active_ids:
+                del self._cpu_samples[container_id]
+        for key in list(self._cgroup_dirs):
+            if key[0] not in active_ids:
+                del self._cgroup_dirs[key]
+        active_names = {container["name"] for container in containers}
+        with self._stats_lock:
+            for name in list(self._stats_cache):
+                if name not in active_names:
+                    del self._stats_cache[name]
+
+        all_stats, gone = self.get_cgroup_container_stats(containers)
+        if all_stats:
+            self._cgroup_usable = True
+
+        gone_names = set(gone)
+        pending = [
+            c
+            for c in containers
+            if c["name"] not in all_stats and c["name"] not in gone_names
+        ]
+        if pending:
+            api_stats, api_gone = self.get_api_container_stats(pending)
+            all_stats.update(api_stats)
+            # dockerd已经报告不存在的容器不再尝试docker stats
+            gone.extend(api_gone)
+            gone_names.update(api_gone)
+            pending = [
+                c
+                for c in pending
+                if c["name"] not in all_stats and c["name"] not in gone_names
+            ]
+
+        # cgroup可用时个别容器读取失败（如使用了--cgroup-parent）不值得让dockerd持续计算
+        # 所有容器的统计信息，直接使用一次性的docker stats调用
+        if pending and not self._cgroup_usable:
+            all_stats.update(
+                self.get_cached_container_stats([c["name"] for c in pending])
+            )
+            pending = [c for c in pending if c["name"] not in all_stats]
+
+        if pending:
+            all_stats.update(self.get_all_container_stats([c["name"] for c in pending]))
+
+        return all_stats, gone
+
+    def _stats_reader_loop(self):
+        """
+        后台线程：维持一个常驻的docker stats进程，逐行解析输出并缓存每个容器的最新数据
+
+        docker stats进程退出后会自动重启，直到调用close()为止
+        """
+        while not self._stats_stop.is_set():
+            try:
+                self._stats_proc = subprocess.Popen(
+                    ["docker", "stats", "--format", STATS_FORMAT],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    universal_newlines=True,
+                    bufsize=1,
+                )
+                self.logger.debug(
+                    "启动常驻docker stats进程: PID=%s", self._stats_proc.pid
+                )
+
+                for line in self._stats_proc.stdout:
+                    stats = self.parse_stats_line(line)
+                    if stats:
+                        with self._stats_lock:
+                            self._stats_cache[stats.container] = (
+                                time.monotonic(),
+                                stats,
+                            )
+
+                self._stats_proc.wait()
+                if not self._stats_stop.is_set():
+                    self.logger.warning(
+                        f"常驻docker stats进程退出(返回码 {self._stats_proc.returncode})，准备重启"
+                    )
+            except Exception as e:
+                self.logger.error(f"常驻docker stats进程运行出错: {e}")
+
+            # 避免docker不可用时频繁重启
+            self._stats_stop.wait(self.interval)
+
+    def get_cached_container_stats(
+        self, container_names: List[str]
+    ) -> Dict[str, ContainerStats]:
+        """
+        从常驻docker stats进程的缓存中读取容器统计信息
+
+        首次调用时启动常驻docker stats进程；超过两个监控间隔仍未刷新的数据视为过期，不会返回
+
+        Args:
+            container_names: 容器名称列表
+
+        Returns:
+            容器名称到资源统计信息的映射
+        """
+        if self._stats_thread is None:
+            self._stats_thread = threading.Thread(
+                target=self._stats_reader_loop, name="docker-stats-reader", daemon=True
+            )
+            self._stats_thread.start()
+
+        now = time.monotonic()
+        max_age = max(self.interval * 2, 5)
+
+        stats_map = {}
+        with self._stats_lock:
+            for name in container_names:
+                cached = self._stats_cache.get(name)
+                if cached and now - cached[0] <= max_age:
+                    stats_map[name] = cached[1]
+        return stats_map
+
+    def _terminate_process(self, proc: Optional[subprocess.Popen]):
+        """终止常驻子进程，5秒内未退出时强制结束"""
+        if proc and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    def close(self):
+        """停止常驻docker stats/nvidia-smi进程、关闭Docker API连接、CSV文件和NVML并释放资源"""
+        self._stats_stop.set()
+        self._smi_stop.set()
+        self._terminate_process(self._stats_proc)
+        self._terminate_process(self._smi_proc)
+        if self._stats_thread is not None:
+            self._stats_thread.join(timeout=5)
+        if self._smi_thread is not None:
+            self._smi_thread.join(timeout=5)
+        self._pool.shutdown(wait=True)
+        if self._docker is not None:
+            self._docker.close()
+        self._close_writer()
+        for csvfile, _ in self._csv_handles.values():
+            csvfile.close()
+        self._csv_handles.clear()
+        self._shutdown_nvml()
+
+    def _probe_gpu(self) -> bool:
+        """检测是否有可用的NVIDIA GPU，NVML可用时直接使用已缓存的设备句柄"""
+        if self._nvml:
+            return bool(self._nvml_handles)
         try:
-            # 使用docker stats --no-stream --format获取一次性统计信息，使用简单格式
             result = subprocess.run(
-                [
-                    "docker",
-                    "stats",
-                    "--no-stream",
-                    "--format",
-                    "{{.Container}} {{.CPUPerc}} {{.MemUsage}} {{.MemPerc}} {{.NetIO}} {{.BlockIO}} {{.PIDs}}",
-                    container_name,
-                ],
+                [self._smi_path, "-L"],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                universal_newlines=True,
-                check=True,
             )
+        except OSError as e:
+            self.logger.debug("检测GPU失败: %s", e)
+            return False
+        return result.returncode == 0 and b"GPU" in result.stdout
+
+    def _gpu_ready(self) -> bool:
+        """GPU是否可以查询；不可用时每隔_GPU_REPROBE_DELAY秒重新检测一次"""
+        if self._gpu_available:
+            return True
+        now = time.monotonic()
+        if now < self._gpu_reprobe_at:
+            return False
+        self._gpu_available = self._probe_gpu()
+        if self._gpu_available:
+            self._gpu_failures = 0
+            self.logger.info("检测到NVIDIA GPU，恢复GPU监控")
+        else:
+            self._gpu_reprobe_at = now + self._GPU_REPROBE_DELAY
+        return self._gpu_available
 
-            self.logger.debug(f"Docker stats 原始输出:\n{result.stdout}")
-            self.logger.debug(f"Docker stats 错误输出:\n{result.stderr}")
-
-            lines = result.stdout.strip().split("\n")
-            self.logger.debug(f"Docker stats 行数: {len(lines)}")
-
-            for i, line in enumerate(lines):
-                self.logger.debug(f"Stats第{i+1}行: '{line}'")
-
-            if len(lines) >= 1:  # 只有数据行，没有表头
-                data_line = lines[0]
-                # 使用空格分割，但需要处理内存使用量中的空格（如 "951.7MiB / 250.3GiB"）
-                # 先按空格分割，然后合并内存相关的部分
-                parts = data_line.split()
-                self.logger.debug(f"数据行分割后: {parts}")
-
-                if len(parts) >= 7:
-                    # 重新组合，因为内存使用量被分割了
-                    # 格式: container cpu_percent mem1 / mem2 mem_percent net1 / net2 block1 / block2 pids
-                    container = parts[0]
-                    cpu_percent = parts[1]
-                    # 内存使用量通常是 "数字单位 / 数字单位" 的格式，可能被分割为3部分
-                    mem_usage = (
-                        f"{parts[2]} {parts[3]} {parts[4]}"  # "951.7MiB / 250.3GiB"
-                    )
-                    mem_percent = parts[5]
-                    # 网络IO也是 "数字 / 数字" 格式
-                    net_io = f"{parts[6]} {parts[7]} {parts[8]}"  # "746B / 0B"
-                    # 块IO也是 "数字 / 数字" 格式
-                    block_io = f"{parts[9]} {parts[10]} {parts[11]}"  # "848kB / 254MB"
-                    pids = parts[12]
-
-                    stats_dict = {
-                        "container": container,
-                        "cpu_percent": cpu_percent,
-                        "mem_usage": mem_usage,
-                        "mem_percent": mem_percent,
-                        "net_io": net_io,
-                        "block_io": block_io,
-                        "pids": pids,
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    }
-                    self.logger.debug(f"解析得到的统计信息: {stats_dict}")
-                    return stats_dict
-                else:
-                    self.logger.warning(f"数据行分割后部分数量不足: {len(parts)}")
-            else:
-                self.logger.warning(f"Docker stats输出行数不足: {len(lines)}")
+    def _check_persistence_mode(self):
+        """
+        启动时检查一次GPU持久模式，未开启时驱动会在查询之间卸载，每次查询都要重新初始化
 
-            return None
+        优先使用NVML，不可用时使用nvidia-smi；没有GPU或查询失败时不做提示
+        """
+        disabled = []
+        if self._nvml:
+            for index, handle in enumerate(self._nvml_handles):
+                mode = self._nvml_value(
+                    pynvml.nvmlDeviceGetPersistenceMode, handle, default=None
+                )
+                if mode == 0:
+                    disabled.append(str(index))
+        else:
+            output = self._run_nvidia_smi(
+                (
+                    self._smi_path,
+                    "--query-gpu=index,persistence_mode",
+                    "--format=csv,noheader",
+                )
+            )
+            if output is None:
+                return
+            for row in csv.reader(output.splitlines(), skipinitialspace=True):
+                if len(row) == 2 and row[1] == "Disabled":
+                    disabled.append(row[0])
+
+        if disabled:
+            self.logger.warning(
+                f"GPU {','.join(disabled)} 未开启持久模式，GPU信息查询会明显变慢，"
+                "建议执行 nvidia-smi -pm 1 或启用 nvidia-persistenced 服务"
+            )
 
-        except subprocess.CalledProcessError as e:
-            self.logger.error(f"获取容器 {container_name} 统计信息失败: {e}")
-            self.logger.error(
-                f"命令执行错误输出: {e.stderr if hasattr(e, 'stderr') else '无'}"
+    def _shutdown_nvml(self):
+        """关闭NVML，可重复调用"""
+        if not self._nvml:
+            return
+        self._nvml = False
+        self._nvml_handles = []
+        try:
+            pynvml.nvmlShutdown()
+        except Exception as e:
+            self.logger.debug("NVML关闭失败: %s", e)
+
+    def _docker_sample_all(
+        self, container_names: List[str]
+    ) -> Dict[str, ContainerStats]:
+        """
+        执行一次docker stats --no-stream，以NDJSON格式（每行一个JSON对象）获取所有指定容器的统计信息
+
+        Args:
+            container_names: 容器名称列表
+
+        Returns:
+            容器名称到资源统计信息的映射，输出中缺失或无法解析的容器不在结果中
+        """
+        result = subprocess.run(
+            [
+                "docker",
+                "stats",
+                "--no-stream",
+                "--no-trunc",
+                "--format",
+                "{{json .}}",
+            ]
+            + list(container_names),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+        # 部分容器在两次调用之间退出时docker stats会返回非零，但其余容器的数据仍然有效
+        if result.returncode != 0:
+            self.logger.warning(
+                f"docker stats 返回码 {result.returncode}: "
+                f"{result.stderr.decode('utf-8', 'replace').strip()}"
             )
-            return None
+
+        lines = result.stdout.splitlines()
+        self.logger.debug("Docker stats 行数: %s", len(lines))
+
+        stats_map = {}
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                item = loads_json(line)
+                stats = ContainerStats._make(item[key] for key in STATS_JSON_KEYS)
+            except (ValueError, KeyError, TypeError) as e:
+                self.logger.debug("docker stats输出行格式不正确: %r (%s)", line, e)
+                continue
+            if debug:
+                self.logger.debug("Docker stats: %s", stats)
+            stats_map[stats.container] = stats
+
+        return stats_map
+
+    def get_all_container_stats(
+        self, container_names: List[str]
+    ) -> Dict[str, ContainerStats]:
+        """
+        一次性获取多个容器的资源使用统计信息
+
+        所有容器共用一次docker stats调用，避免每个容器单独启动一个子进程
+
+        Args:
+            container_names: 容器名称列表
+
+        Returns:
+            容器名称到资源统计信息的映射，获取失败的容器不在结果中
+        """
+        if not container_names:
+            return {}
+
+        try:
+            return self._docker_sample_all(container_names)
         except Exception as e:
             self.logger.error(f"处理容器统计信息时出错: {e}")
+            return {}
+
+    def get_container_stats(self, container_name: str) -> Optional[ContainerStats]:
+        """
+        获取单个容器的资源使用统计信息
+
+        Args:
+            container_name: 容器名称
+
+        Returns:
+            资源统计信息，如果获取失败返回None
+        """
+        return self.get_all_container_stats([container_name]).get(container_name)
+
+    def parse_stats_line(self, line: str) -> Optional[ContainerStats]:
+        """
+        解析docker stats输出的一行数据（STATS_FORMAT格式）
+
+        Args:
+            line: 以|分隔的docker stats输出行，常驻进程的输出可能带有刷新屏幕的控制序列
+
+        Returns:
+            资源统计信息（不含timestamp），如果解析失败返回None
+        """
+        parts = ANSI_ESCAPE_RE.sub("", line).strip().split("|", 6)
+        if len(parts) != 7 or not parts[0]:
+            self.logger.debug("docker stats输出行格式不正确: %r", line)
             return None
 
+        return ContainerStats._make(parts)
+
     def sanitize_folder_name(self, name: str) -> str:
         """
         清理模块名称，使其适合作为文件夹名称
@@ -317,13 +1353,11 @@ class WemolResourceRecorder:
         Returns:
             清理后的名称
         """
-        import re
-
         # 移除或替换不适合做文件夹名的字符
         # 保留字母、数字、中文字符、空格、连字符、下划线和圆括号
-        sanitized = re.sub(r'[<>:"/\\|?*]', "_", name)
+        sanitized = SANITIZE_BAD_RE.sub("_", name)
         # 替换多个连续空格为单个空格
-        sanitized = re.sub(r"\s+", " ", sanitized)
+        sanitized = SANITIZE_WS_RE.sub(" ", sanitized)
         # 去除首尾空格
         sanitized = sanitized.strip()
         # 如果为空，使用默认名称
@@ -331,18 +1365,22 @@ class WemolResourceRecorder:
             sanitized = "Unknown_Module"
         return sanitized
 
-    def setup_csv_file(self, task_id: str) -> str:
+    def setup_csv_file(self, task_id: str, worker_type: Optional[str] = None) -> str:
         """
         设置CSV文件，按模块名分类存储
 
         Args:
             task_id: 任务ID
+            worker_type: Worker类型，可选
 
         Returns:
             CSV文件路径
         """
+        if task_id in self.csv_files:
+            return self.csv_files[task_id]
+
         # 获取模块名称
-        module_name = self.get_module_name(task_id)
+        module_name = self.get_module_name(task_id, worker_type)
 
         # 清理模块名称，使其适合作为文件夹名
         safe_module_name = self.sanitize_folder_name(module_name)
@@ -354,119 +1392,213 @@ class WemolResourceRecorder:
         # CSV文件路径: module_resource/{module_name}/{task_id}.csv
         csv_filename = os.path.join(module_dir, f"{task_id}.csv")
 
-        # 如果文件不存在，创建并写入表头
-        if not os.path.exists(csv_filename):
-            with open(csv_filename, "w", newline="", encoding="utf-8") as csvfile:
-                fieldnames = [
-                    "task_id",
-                    "job_id",
-                    "module_name",
-                    "timestamp",
-                    "container",
-                    "cpu_percent",
-                    "mem_usage",
-                    "mem_percent",
-                    "net_io",
-                    "block_io",
-                    "pids",
-                    "gpu_count",
-                    "gpu_ids",
-                    "gpu_names",
-                    "gpu_memory_used",
-                    "gpu_memory_total",
-                    "gpu_utilization",
-                    "gpu_memory_utilization",
-                    "gpu_temperature",
-                    "gpu_fan_speed",
-                    "gpu_power_draw",
-                    "gpu_power_limit",
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
+        # 打开（或复用）CSV文件句柄，如果文件不存在，创建并写入表头
+        handle = self._csv_handles.get(task_id)
+        if handle is None or handle[0].name != csv_filename:
+            if handle is not None:
+                self._flush_rows(task_id)
+                handle[0].close()
+
+            is_new_file = not os.path.exists(csv_filename)
+            csvfile = open(
+                csv_filename, "a", newline="", buffering=64 * 1024, encoding="utf-8"
+            )
+            writer = csv.writer(csvfile)
+            self._csv_handles[task_id] = (csvfile, writer)
+
+            if is_new_file:
+                writer.writerow(self._FIELDNAMES)
+                self.logger.info(f"创建CSV文件: {csv_filename} (模块: {module_name})")
 
-            self.logger.info(f"创建CSV文件: {csv_filename} (模块: {module_name})")
+        # 模块名称尚未获取到时不缓存，task.json出现后可以切换到正确的模块目录
+        if task_id in self.module_names:
+            self.csv_files[task_id] = csv_filename
 
         return csv_filename
 
-    def record_stats(self, container_info: Dict, stats: Dict):
+    def _flush_rows(self, task_id: str):
+        """
+        将任务缓冲中的记录一次性写入CSV文件并刷新到磁盘
+
+        Args:
+            task_id: 任务ID
+        """
+        rows = self._row_buffers.get(task_id)
+        handle = self._csv_handles.get(task_id)
+        if not rows or handle is None:
+            return
+
+        csvfile, writer = handle
+        writer.writerows(rows)
+        csvfile.flush()
+        self.logger.debug("写入 %s 行数据到 %s", len(rows), csvfile.name)
+        rows.clear()
+        self._row_buffer_since.pop(task_id, None)
+
+    def _flush_all(self):
+        """将所有任务缓冲中的记录写入CSV文件，用于程序退出时避免丢失数据"""
+        for task_id in list(self._row_buffers):
+            try:
+                self._flush_rows(task_id)
+            except Exception as e:
+                self.logger.error(f"写入任务 {task_id} 的缓冲数据时出错: {e}")
+
+    def _writer_loop(self):
+        """后台线程：按提交顺序执行队列中的CSV写入操作，直到收到None"""
+        while True:
+            item = self._write_q.get()
+            if item is None:
+                break
+            func, args = item
+            try:
+                func(*args)
+            except Exception as e:
+                self.logger.error(f"写入CSV文件时出错: {e}")
+
+    def _close_writer(self):
+        """停止写入线程并写入所有缓冲数据，可重复调用；用于程序退出时避免丢失数据"""
+        if self._writer_thread.is_alive():
+            # 队列中已提交的记录会先于None被处理
+            self._write_q.put(None)
+            self._writer_thread.join()
+        self._flush_all()
+
+    def close_inactive_csv_files(self, active_task_ids: List[str]):
+        """
+        关闭已不再运行的任务的CSV文件句柄并清理其缓存，避免长期运行时文件句柄和内存泄漏
+
+        Args:
+            active_task_ids: 本轮仍在运行的任务ID列表
+        """
+        active = set(active_task_ids)
+        for task_id in list(self._csv_handles):
+            if task_id not in active:
+                self._flush_rows(task_id)
+                csvfile, _ = self._csv_handles.pop(task_id)
+                csvfile.close()
+                self.csv_files.pop(task_id, None)
+                self.logger.debug("关闭任务 %s 的CSV文件: %s", task_id, csvfile.name)
+
+        # 已结束任务的模块名称和Worker类型缓存一并清理
+        for cache in (self.module_names, self._task_worker_types):
+            for task_id in list(cache):
+                if task_id not in active:
+                    cache.pop(task_id, None)
+
+    def record_stats(
+        self,
+        container_info: Dict,
+        stats: ContainerStats,
+        gpu_info: ContainerGPUInfo,
+        timestamp: str,
+    ):
         """
         将统计信息记录到CSV文件
 
         Args:
             container_info: 容器信息
             stats: 统计信息
+            gpu_info: GPU使用信息（get_gpu_info_for_container的结果）
+            timestamp: 本轮采样时间，同一轮的所有容器共用
         """
         try:
             task_id = container_info["task_id"]
-            csv_file = self.setup_csv_file(task_id)
+            worker_type = container_info.get("worker_type")
+            csv_file = self.setup_csv_file(task_id, worker_type)
 
             # 获取模块名称
-            module_name = self.get_module_name(task_id)
-
-            # 获取GPU信息
-            gpu_info = self.get_gpu_info_for_container(container_info["name"])
-
-            # 准备记录数据
-            record = {
-                "task_id": task_id,
-                "job_id": container_info["job_id"],
-                "module_name": module_name,
-                "timestamp": stats["timestamp"],
-                "container": stats["container"],
-                "cpu_percent": stats["cpu_percent"],
-                "mem_usage": stats["mem_usage"],
-                "mem_percent": stats["mem_percent"],
-                "net_io": stats["net_io"],
-                "block_io": stats["block_io"],
-                "pids": stats["pids"],
-                "gpu_count": gpu_info["gpu_count"],
-                "gpu_ids": gpu_info["gpu_ids"],
-                "gpu_names": gpu_info["gpu_names"],
-                "gpu_memory_used": gpu_info["gpu_memory_used"],
-                "gpu_memory_total": gpu_info["gpu_memory_total"],
-                "gpu_utilization": gpu_info["gpu_utilization"],
-                "gpu_memory_utilization": gpu_info["gpu_memory_utilization"],
-                "gpu_temperature": gpu_info["gpu_temperature"],
-                "gpu_fan_speed": gpu_info["gpu_fan_speed"],
-                "gpu_power_draw": gpu_info["gpu_power_draw"],
-                "gpu_power_limit": gpu_info["gpu_power_limit"],
-            }
+            module_name = self.get_module_name(task_id, worker_type)
 
-            # 写入CSV文件
-            with open(csv_file, "a", newline="", encoding="utf-8") as csvfile:
-                fieldnames = list(record.keys())
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writerow(record)
+            # 准备记录数据，列顺序与_FIELDNAMES一致
+            record = (
+                (task_id, container_info["job_id"], module_name, timestamp)
+                + stats
+                + gpu_info
+            )
+
+            # 先加入缓冲，累积到一定行数或等待时间过长时再批量写入CSV文件
+            rows = self._row_buffers.setdefault(task_id, [])
+            if not rows:
+                self._row_buffer_since[task_id] = time.monotonic()
+            rows.append(record)
 
-            self.logger.debug(f"记录数据到 {csv_file}: {record}")
+            self.logger.debug("记录数据到 %s: %s", csv_file, record)
+
+            if (
+                len(rows) >= self._FLUSH_EVERY
+                or time.monotonic() - self._row_buffer_since[task_id]
+                >= self._FLUSH_MAX_DELAY
+            ):
+                self._flush_rows(task_id)
 
         except Exception as e:
             self.logger.error(f"记录统计信息时出错: {e}")
 
-    def get_container_processes(self, container_name: str) -> List[str]:
+    def get_container_processes(
+        self, container_name: str, container_id: Optional[str] = None
+    ) -> List[str]:
         """
-        获取容器内部运行的进程PID列表
+        获取容器内部运行的进程PID列表（宿主机PID命名空间）
 
         Args:
             container_name: 容器名称
+            container_id: 完整容器ID，提供时优先读取cgroup.procs
 
         Returns:
             进程PID列表
         """
-        try:
-            # 方法1: 使用docker top获取容器内进程
-            result = subprocess.run(
-                ["docker", "top", container_name],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                check=True,
+        # 方法1: 直接读取容器cgroup的cgroup.procs，一次文件读取即可拿到全部PID
+        if container_id:
+            procs = self._read_cgroup_file(
+                container_id, "" if self._cgroup_v2 else "memory", "cgroup.procs"
             )
+            if procs is not None:
+                pids = procs.split()
+                self.logger.debug(
+                    "通过cgroup找到容器 %s 的进程PID: %s", container_name, pids
+                )
+                return pids
 
-            self.logger.debug(f"Docker top {container_name} 输出:\n{result.stdout}")
-
+        try:
             pids = []
-            lines = result.stdout.strip().split("\n")
+
+            # 方法2: 通过Docker Engine API获取容器内进程（等价于docker top）
+            api_ok = False
+            if self._docker is not None:
+                try:
+                    top = self._docker.get(f"/containers/{quote(container_name)}/top")
+                    pid_index = top.get("Titles", []).index("PID")
+                    for process in top.get("Processes") or []:
+                        pid = process[pid_index]
+                        if pid.isdigit():
+                            pids.append(pid)
+                    api_ok = True
+                    self.logger.debug(
+                        "通过Docker API找到容器 %s 的进程PID: %s", container_name, pids
+                    )
+                except Exception as e:
+                    self.logger.debug(
+                        "通过Docker API获取容器 %s 进程失败，回退到docker top: %s",
+                        container_name,
+                        e,
+                    )
+
+            # 方法2备选: 使用docker top获取容器内进程
+            lines = []
+            if not api_ok:
+                result = subprocess.run(
+                    ["docker", "top", container_name],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    universal_newlines=True,
+                    check=True,
+                )
+
+                self.logger.debug(
+                    "Docker top %s 输出:\n%s", container_name, result.stdout
+                )
+
+                lines = result.stdout.strip().split("\n")
 
             # 跳过表头
             if len(lines) > 1:
@@ -478,35 +1610,11 @@ class WemolResourceRecorder:
                         if pid.isdigit():
                             pids.append(pid)
                             self.logger.debug(
-                                f"找到容器 {container_name} 的进程PID: {pid}"
+                                "找到容器 %s 的进程PID: %s", container_name, pid
                             )
 
-            # 方法2: 如果docker top失败，尝试通过ps aux查找
-            if not pids:
-                self.logger.debug(f"Docker top未找到进程，尝试ps aux方法")
-                result2 = subprocess.run(
-                    ["ps", "aux"],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True,
-                    check=True,
-                )
-
-                lines = result2.stdout.strip().split("\n")
-                for line in lines:
-                    # 查找包含容器名称或容器ID的进程
-                    if container_name in line or container_name[:12] in line:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            pid = parts[1]
-                            if pid.isdigit():
-                                pids.append(pid)
-                                self.logger.debug(
-                                    f"通过ps aux找到容器 {container_name} 的进程PID: {pid}"
-                                )
-
             self.logger.debug(
-                f"容器 {container_name} 总共找到 {len(pids)} 个进程: {pids}"
+                "容器 %s 总共找到 %s 个进程: %s", container_name, len(pids), pids
             )
             return pids
 
@@ -517,72 +1625,110 @@ class WemolResourceRecorder:
             self.logger.error(f"处理容器进程信息时出错: {e}")
             return []
 
-    def get_nvidia_smi_info(self) -> Dict[str, Dict]:
+    def _run_nvidia_smi(self, argv: Tuple[str, ...]) -> Optional[str]:
         """
-        获取nvidia-smi的GPU使用信息
+        执行一次nvidia-smi命令并返回标准输出
+
+        nvidia-smi的输出只包含ASCII字符，按字节读取后一次性解码，不做换行符转换；
+        失败时按返回码判断，不构造CalledProcessError
+
+        Args:
+            argv: 完整的命令行（以nvidia-smi路径开头，通常为预先拼好的元组）
 
         Returns:
-            PID到GPU信息的映射字典
+            标准输出文本，命令无法执行或返回码非零时返回None
         """
         try:
-            # 方法1: 使用nvidia-smi查询进程信息
             result = subprocess.run(
-                [
-                    "nvidia-smi",
-                    "--query-compute-apps=pid,gpu_uuid,used_memory",
-                    "--format=csv,noheader,nounits",
-                ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                check=True,
+                argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE
             )
+            returncode = result.returncode
+        except OSError as e:
+            self.logger.debug("nvidia-smi无法执行: %s", e)
+            returncode = None
 
-            self.logger.debug(f"nvidia-smi query-compute-apps 输出:\n{result.stdout}")
+        if returncode == 0:
+            self._gpu_failures = 0
+            return result.stdout.decode("ascii", "replace")
 
-            pid_gpu_map = {}
-            lines = result.stdout.strip().split("\n")
+        if returncode is not None and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "nvidia-smi %s 返回码 %s: %s",
+                argv[1],
+                returncode,
+                result.stderr.decode("ascii", "replace").strip(),
+            )
 
-            for line in lines:
-                if line.strip():
-                    parts = [p.strip() for p in line.split(",")]
-                    if len(parts) >= 3:
-                        try:
-                            pid = parts[0]
-                            gpu_uuid = parts[1]
-                            used_memory = parts[2]
+        # 连续失败时暂停GPU监控，避免每轮都等待一次失败的nvidia-smi
+        self._gpu_failures += 1
+        if self._gpu_available and self._gpu_failures >= self._GPU_MAX_FAILURES:
+            self._gpu_available = False
+            self._gpu_reprobe_at = time.monotonic() + self._GPU_REPROBE_DELAY
+            self.logger.warning(
+                f"nvidia-smi连续失败{self._gpu_failures}次，暂停GPU监控，"
+                f"{self._GPU_REPROBE_DELAY}秒后重新检测"
+            )
+        return None
 
-                            if pid.isdigit():
-                                # 获取GPU ID（从UUID中提取或使用简单编号）
-                                gpu_id = self.get_gpu_id_from_uuid(gpu_uuid)
+    def get_nvidia_smi_info(
+        self, uuid_map: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Dict]:
+        """
+        获取nvidia-smi的GPU使用信息
 
-                                pid_gpu_map[pid] = {
-                                    "gpu_id": gpu_id,
-                                    "gpu_uuid": gpu_uuid,
-                                    "used_memory": used_memory,
-                                    "sm_util": "N/A",  # compute-apps查询不包含利用率
-                                    "mem_util": "N/A",
-                                }
-                                self.logger.debug(
-                                    f"GPU进程映射: PID={pid} GPU={gpu_id} MEM={used_memory}MB"
-                                )
-                        except (ValueError, IndexError):
-                            continue
+        Args:
+            uuid_map: GPU UUID到GPU ID的映射，未提供时查询一次nvidia-smi获取
+
+        Returns:
+            PID到GPU信息的映射字典
+        """
+        try:
+            # 方法1: 使用nvidia-smi查询进程信息
+            output = self._run_nvidia_smi(self._smi_apps_argv)
+            if output is None:
+                return {}
+
+            self.logger.debug("nvidia-smi query-compute-apps 输出:\n%s", output)
+
+            pid_gpu_map = {}
+
+            # nvidia-smi的csv输出以", "分隔，csv.reader一次完成切分并去掉分隔符后的空格
+            for row in csv.reader(output.splitlines(), skipinitialspace=True):
+                if len(row) < 3:
+                    continue
+                pid, gpu_uuid, used_memory = row[0], row[1], row[2]
+
+                if pid.isdigit():
+                    # 获取GPU ID（从UUID映射中查找，映射只在首次需要时查询一次）
+                    if uuid_map is None:
+                        uuid_map = self.get_gpu_uuid_map()
+                    gpu_id = self.get_gpu_id_from_uuid(gpu_uuid, uuid_map)
+
+                    pid_gpu_map[pid] = {
+                        "gpu_id": gpu_id,
+                        "gpu_uuid": gpu_uuid,
+                        "used_memory": used_memory,
+                        "sm_util": "N/A",  # compute-apps查询不包含利用率
+                        "mem_util": "N/A",
+                    }
+                    self.logger.debug(
+                        "GPU进程映射: PID=%s GPU=%s MEM=%sMB",
+                        pid,
+                        gpu_id,
+                        used_memory,
+                    )
 
             # 方法2: 如果上面的方法没有结果，尝试pmon方式
             if not pid_gpu_map:
                 self.logger.debug("尝试使用nvidia-smi pmon方法")
-                result2 = subprocess.run(
-                    ["nvidia-smi", "pmon", "-c", "1", "-s", "um"],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True,
-                    check=True,
-                )
+                output = self._run_nvidia_smi(self._smi_pmon_argv)
 
-                self.logger.debug(f"nvidia-smi pmon 输出:\n{result2.stdout}")
+                if output is None:
+                    return pid_gpu_map
 
-                lines = result2.stdout.strip().split("\n")
+                self.logger.debug("nvidia-smi pmon 输出:\n%s", output)
+
+                lines = output.strip().split("\n")
                 for line in lines:
                     # 跳过注释行和空行
                     if line.startswith("#") or not line.strip():
@@ -605,60 +1751,152 @@ class WemolResourceRecorder:
                                     "mem_util": mem_util,
                                 }
                                 self.logger.debug(
-                                    f"GPU进程映射(pmon): PID={pid} GPU={gpu_id} SM={sm_util}% MEM={mem_util}%"
+                                    "GPU进程映射(pmon): PID=%s GPU=%s SM=%s%% MEM=%s%%",
+                                    pid,
+                                    gpu_id,
+                                    sm_util,
+                                    mem_util,
                                 )
                         except (ValueError, IndexError):
                             continue
 
             return pid_gpu_map
 
-        except subprocess.CalledProcessError as e:
-            self.logger.debug(f"nvidia-smi命令执行失败: {e}")
-            return {}
         except Exception as e:
-            self.logger.debug(f"处理nvidia-smi信息时出错: {e}")
+            self.logger.debug("处理nvidia-smi信息时出错: %s", e)
+            return {}
+
+    def _parse_gpu_query_row(self, row: List[str]) -> Optional[Dict[str, str]]:
+        """解析csv.reader读出的一行nvidia-smi --query-gpu输出（GPU_QUERY_FIELDS顺序），格式不正确时返回None"""
+        if len(row) != len(GPU_QUERY_FIELDS):
+            if row:
+                self.logger.debug("解析GPU信息行失败: %s", row)
+            return None
+        return dict(zip(GPU_QUERY_FIELDS, row))
+
+    def _smi_reader_loop(self):
+        """
+        后台线程：维持一个常驻的nvidia-smi -lms进程，逐行解析输出并保存每块GPU的最新数据
+
+        nvidia-smi进程退出后会自动重启，直到调用close()为止
+        """
+        interval_ms = str(max(int(self.interval * 1000), 100))
+        while not self._smi_stop.is_set():
+            if not self._gpu_available:
+                # GPU监控暂停期间不启动nvidia-smi
+                self._smi_stop.wait(self.interval)
+                continue
+            try:
+                self._smi_proc = subprocess.Popen(
+                    self._smi_gpu_argv + ("-lms", interval_ms),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+                self.logger.debug("启动常驻nvidia-smi进程: PID=%s", self._smi_proc.pid)
+
+                # 按字节逐行读取，每行只做一次ASCII解码
+                lines = (
+                    line.decode("ascii", "replace") for line in self._smi_proc.stdout
+                )
+                for row in csv.reader(lines, skipinitialspace=True):
+                    fields = self._parse_gpu_query_row(row)
+                    if fields:
+                        latest = self._gpu_latest.get(fields["index"])
+                        if latest is None:
+                            latest = self._gpu_latest.setdefault(
+                                fields["index"], deque(maxlen=1)
+                            )
+                        latest.append((time.monotonic(), fields))
+
+                self._smi_proc.wait()
+                if not self._smi_stop.is_set():
+                    self.logger.warning(
+                        f"常驻nvidia-smi进程退出(返回码 {self._smi_proc.returncode})，准备重启"
+                    )
+            except Exception as e:
+                self.logger.error(f"常驻nvidia-smi进程运行出错: {e}")
+
+            # 避免nvidia-smi不可用时频繁重启
+            self._smi_stop.wait(self.interval)
+
+    def _sample_gpu_once(self) -> Dict[str, Dict[str, str]]:
+        """
+        获取本轮GPU_QUERY_FIELDS中的全部字段，结果在本轮监控内缓存
+
+        首次调用时启动常驻nvidia-smi -lms进程，之后优先使用其推送的最新数据；
+        数据缺失或超过两个监控间隔未刷新时执行一次nvidia-smi --query-gpu补齐
+
+        Returns:
+            GPU ID到{字段名: 值}的映射，查询失败返回空字典
+        """
+        if self._gpu_sample is not None:
+            return self._gpu_sample
+        if not self._gpu_ready():
             return {}
 
-    def get_gpu_id_from_uuid(self, gpu_uuid: str) -> str:
+        if self._smi_thread is None:
+            self._smi_thread = threading.Thread(
+                target=self._smi_reader_loop, name="nvidia-smi-reader", daemon=True
+            )
+            self._smi_thread.start()
+
+        now = time.monotonic()
+        max_age = max(self.interval * 2, 5)
+        sample = {}
+        for gpu_id, latest in list(self._gpu_latest.items()):
+            if latest and now - latest[-1][0] <= max_age:
+                sample[gpu_id] = latest[-1][1]
+        if sample and len(sample) == len(self._gpu_latest):
+            self._gpu_sample = sample
+            return sample
+
+        sample = {}
+        try:
+            output = self._run_nvidia_smi(self._smi_gpu_argv)
+            if output is not None:
+                self.logger.debug("nvidia-smi GPU查询输出:\n%s", output)
+
+                for row in csv.reader(output.splitlines(), skipinitialspace=True):
+                    fields = self._parse_gpu_query_row(row)
+                    if fields:
+                        sample[fields["index"]] = fields
+
+        except Exception as e:
+            self.logger.debug("处理GPU信息时出错: %s", e)
+
+        # 失败时同样缓存空结果，避免本轮重复调用nvidia-smi
+        self._gpu_sample = sample
+        return sample
+
+    def get_gpu_uuid_map(self) -> Dict[str, str]:
+        """
+        获取GPU UUID到GPU ID的映射
+
+        Returns:
+            GPU UUID到GPU ID的映射字典，获取失败返回空字典
+        """
+        return {
+            fields["uuid"]: gpu_id for gpu_id, fields in self._sample_gpu_once().items()
+        }
+
+    def get_gpu_id_from_uuid(self, gpu_uuid: str, uuid_map: Dict[str, str]) -> str:
         """
         从GPU UUID获取GPU ID
 
         Args:
             gpu_uuid: GPU UUID
+            uuid_map: GPU UUID到GPU ID的映射
 
         Returns:
             GPU ID字符串
         """
-        try:
-            # 尝试获取GPU列表来映射UUID到ID
-            result = subprocess.run(
-                [
-                    "nvidia-smi",
-                    "--query-gpu=index,uuid",
-                    "--format=csv,noheader,nounits",
-                ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                check=True,
-            )
-
-            lines = result.stdout.strip().split("\n")
-            for line in lines:
-                if line.strip():
-                    parts = [p.strip() for p in line.split(",")]
-                    if len(parts) >= 2:
-                        gpu_id = parts[0]
-                        uuid = parts[1]
-                        if uuid == gpu_uuid:
-                            return gpu_id
-
-            # 如果找不到匹配的UUID，返回"Unknown"
-            return "Unknown"
+        if gpu_uuid in uuid_map:
+            return uuid_map[gpu_uuid]
 
-        except:
-            # 如果出错，返回UUID的简短形式
+        # 映射获取失败时返回UUID的简短形式，映射中找不到时返回"Unknown"
+        if not uuid_map:
             return gpu_uuid[-8:] if len(gpu_uuid) > 8 else gpu_uuid
+        return "Unknown"
 
     def get_gpu_detailed_info(self) -> Dict[str, Dict]:
         """
@@ -667,87 +1905,213 @@ class WemolResourceRecorder:
         Returns:
             GPU ID到详细信息的映射字典
         """
+        gpu_info_map = {}
+        for gpu_id, fields in self._sample_gpu_once().items():
+            gpu_info_map[gpu_id] = {
+                "name": fields["name"],
+                "memory_total": fields["memory.total"],
+                "memory_used": fields["memory.used"],
+                "gpu_util": fields["utilization.gpu"],
+                "mem_util": fields["utilization.memory"],
+                "temperature": fields["temperature.gpu"],
+                "fan_speed": fields["fan.speed"],
+                "power_draw": fields["power.draw"],
+                "power_limit": fields["power.limit"],
+            }
+            self.logger.debug("GPU %s 详细信息: %s", gpu_id, gpu_info_map[gpu_id])
+        return gpu_info_map
+
+    def _nvml_value(self, func, *args, default: str = "[Not Supported]"):
+        """调用NVML接口，设备不支持或调用失败时返回默认值"""
         try:
-            # 查询详细的GPU信息
-            result = subprocess.run(
-                [
-                    "nvidia-smi",
-                    "--query-gpu=index,name,memory.total,memory.used,utilization.gpu,utilization.memory,temperature.gpu,fan.speed,power.draw,power.limit",
-                    "--format=csv,noheader,nounits",
-                ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                check=True,
-            )
+            return func(*args)
+        except pynvml.NVMLError:
+            return default
 
-            self.logger.debug(f"nvidia-smi 详细信息输出:\n{result.stdout}")
+    def _nvml_utilization(
+        self, index: int, handle
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """
+        获取GPU利用率和显存利用率
 
-            gpu_info_map = {}
-            lines = result.stdout.strip().split("\n")
+        GPU利用率取驱动环形缓冲区中上次读取之后全部采样的平均值（nvmlDeviceGetSamples），
+        一次调用即可覆盖整个监控间隔；不支持或没有新采样时使用nvmlDeviceGetUtilizationRates的瞬时值
 
-            for line in lines:
-                if line.strip():
-                    parts = [p.strip() for p in line.split(",")]
-                    if len(parts) >= 10:
-                        try:
-                            gpu_id = parts[0]
-                            gpu_name = parts[1]
-                            memory_total = parts[2]
-                            memory_used = parts[3]
-                            gpu_util = parts[4]
-                            mem_util = parts[5]
-                            temperature = parts[6]
-                            fan_speed = parts[7]
-                            power_draw = parts[8]
-                            power_limit = parts[9]
-
-                            gpu_info_map[gpu_id] = {
-                                "name": gpu_name,
-                                "memory_total": memory_total,
-                                "memory_used": memory_used,
-                                "gpu_util": gpu_util,
-                                "mem_util": mem_util,
-                                "temperature": temperature,
-                                "fan_speed": fan_speed,
-                                "power_draw": power_draw,
-                                "power_limit": power_limit,
-                            }
+        Args:
+            index: GPU序号
+            handle: NVML设备句柄
 
-                            self.logger.debug(
-                                f"GPU {gpu_id} 详细信息: {gpu_info_map[gpu_id]}"
-                            )
-                        except (ValueError, IndexError) as e:
-                            self.logger.debug(f"解析GPU信息行失败: {line}, 错误: {e}")
-                            continue
+        Returns:
+            (GPU利用率, 显存利用率)，获取失败时为None
+        """
+        utilization = self._nvml_value(
+            pynvml.nvmlDeviceGetUtilizationRates, handle, default=None
+        )
+        gpu_util = utilization.gpu if utilization else None
+        mem_util = utilization.memory if utilization else None
+
+        result = self._nvml_value(
+            pynvml.nvmlDeviceGetSamples,
+            handle,
+            pynvml.NVML_GPU_UTILIZATION_SAMPLES,
+            self._last_sample_ts.get(index, 0),
+            default=None,
+        )
+        if result:
+            samples = result[1]
+            if samples:
+                self._last_sample_ts[index] = max(
+                    sample.timeStamp for sample in samples
+                )
+                gpu_util = round(
+                    sum(sample.sampleValue.uiVal for sample in samples) / len(samples)
+                )
+        return gpu_util, mem_util
 
-            return gpu_info_map
+    def _gpu_snapshot(self) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+        """
+        通过NVML一次性获取所有GPU的详细信息和GPU进程信息
+
+        返回的数据结构与get_gpu_detailed_info/get_nvidia_smi_info一致，
+        数值格式与nvidia-smi的nounits输出一致
+
+        Returns:
+            (GPU ID到详细信息的映射, PID到GPU信息的映射)
+        """
+        gpu_info_map = {}
+        pid_gpu_map = {}
+
+        try:
+            for index, handle in enumerate(self._nvml_handles):
+                gpu_id = str(index)
+
+                name = self._nvml_value(
+                    pynvml.nvmlDeviceGetName, handle, default="Unknown"
+                )
+                if isinstance(name, bytes):
+                    name = name.decode("utf-8", "replace")
+                uuid = self._nvml_value(pynvml.nvmlDeviceGetUUID, handle, default="N/A")
+                if isinstance(uuid, bytes):
+                    uuid = uuid.decode("utf-8", "replace")
+
+                memory = self._nvml_value(
+                    pynvml.nvmlDeviceGetMemoryInfo, handle, default=None
+                )
+                gpu_util, mem_util = self._nvml_utilization(index, handle)
+                power_draw = self._nvml_value(
+                    pynvml.nvmlDeviceGetPowerUsage, handle, default=None
+                )
+                power_limit = self._nvml_value(
+                    pynvml.nvmlDeviceGetEnforcedPowerLimit, handle, default=None
+                )
+
+                gpu_info_map[gpu_id] = {
+                    "name": name,
+                    "memory_total": str(memory.total // 1048576) if memory else "N/A",
+                    "memory_used": str(memory.used // 1048576) if memory else "N/A",
+                    "gpu_util": "N/A" if gpu_util is None else str(gpu_util),
+                    "mem_util": "N/A" if mem_util is None else str(mem_util),
+                    "temperature": str(
+                        self._nvml_value(
+                            pynvml.nvmlDeviceGetTemperature,
+                            handle,
+                            pynvml.NVML_TEMPERATURE_GPU,
+                            default="N/A",
+                        )
+                    ),
+                    "fan_speed": str(
+                        self._nvml_value(pynvml.nvmlDeviceGetFanSpeed, handle)
+                    ),
+                    "power_draw": (
+                        "%.2f" % (power_draw / 1000.0)
+                        if power_draw is not None
+                        else "N/A"
+                    ),
+                    "power_limit": (
+                        "%.2f" % (power_limit / 1000.0)
+                        if power_limit is not None
+                        else "N/A"
+                    ),
+                }
+                self.logger.debug(
+                    "GPU %s 详细信息(NVML): %s", gpu_id, gpu_info_map[gpu_id]
+                )
+
+                for process in self._nvml_value(
+                    pynvml.nvmlDeviceGetComputeRunningProcesses, handle, default=[]
+                ):
+                    used_memory = getattr(process, "usedGpuMemory", None)
+                    pid_gpu_map[str(process.pid)] = {
+                        "gpu_id": gpu_id,
+                        "gpu_uuid": uuid,
+                        "used_memory": (
+                            str(used_memory // 1048576)
+                            if used_memory is not None
+                            else "N/A"
+                        ),
+                        "sm_util": "N/A",
+                        "mem_util": "N/A",
+                    }
 
-        except subprocess.CalledProcessError as e:
-            self.logger.debug(f"获取GPU详细信息失败: {e}")
-            return {}
         except Exception as e:
-            self.logger.debug(f"处理GPU详细信息时出错: {e}")
-            return {}
+            self.logger.debug("通过NVML获取GPU信息时出错: %s", e)
+
+        return gpu_info_map, pid_gpu_map
 
-    def get_gpu_info_for_container(self, container_name: str) -> Dict[str, str]:
+    def collect_gpu_info(self) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+        """
+        获取本轮所有容器共用的GPU信息，优先使用NVML，不可用时使用nvidia-smi命令
+
+        Returns:
+            (GPU ID到详细信息的映射, PID到GPU信息的映射)
+        """
+        if not self._gpu_ready():
+            return {}, {}
+        if self._nvml:
+            return self._gpu_snapshot()
+
+        gpu_processes = self.get_nvidia_smi_info()
+        # 没有任何GPU进程时无需查询GPU详细信息
+        gpu_detailed_info = self.get_gpu_detailed_info() if gpu_processes else {}
+        return gpu_detailed_info, gpu_processes
+
+    def _join_power_limits(self, gpu_power_limits: List[str]) -> str:
+        """拼接GPU功率上限，与上一次结果相同时直接复用缓存的字符串"""
+        key = tuple(gpu_power_limits)
+        cached_key, cached_value = self._power_limits_cache
+        if key == cached_key:
+            return cached_value
+        value = ",".join(key) if key else "N/A"
+        self._power_limits_cache = (key, value)
+        return value
+
+    def get_gpu_info_for_container(
+        self,
+        container_name: str,
+        gpu_processes: Dict[str, Dict],
+        gpu_detailed_info: Dict[str, Dict],
+        container_id: Optional[str] = None,
+    ) -> ContainerGPUInfo:
         """
         获取容器的GPU使用信息
 
+        GPU进程信息和GPU详细信息由监控循环每轮查询一次后传入，所有容器共用
+
         Args:
             container_name: 容器名称
+            gpu_processes: PID到GPU信息的映射（get_nvidia_smi_info的结果）
+            gpu_detailed_info: GPU ID到详细信息的映射（get_gpu_detailed_info的结果）
+            container_id: 完整容器ID，可选
 
         Returns:
-            GPU使用信息字典
+            GPU使用信息
         """
-        # 获取容器进程PID
-        container_pids = self.get_container_processes(container_name)
-
-        # 获取GPU进程信息
-        gpu_processes = self.get_nvidia_smi_info()
-
-        # 获取详细的GPU信息
-        gpu_detailed_info = self.get_gpu_detailed_info()
+        # 获取容器进程PID，没有任何GPU进程时无需查询
+        container_pids = (
+            self.get_container_processes(container_name, container_id)
+            if gpu_processes
+            else []
+        )
 
         # 匹配PID并收集GPU信息
         gpu_ids = []
@@ -761,193 +2125,316 @@ class WemolResourceRecorder:
         gpu_power_draws = []
         gpu_power_limits = []
 
-        for pid in container_pids:
-            if pid in gpu_processes:
-                gpu_info = gpu_processes[pid]
-                gpu_id = gpu_info["gpu_id"]
-
-                # 避免重复添加同一个GPU
-                if gpu_id not in gpu_ids:
-                    gpu_ids.append(gpu_id)
-
-                    # 从详细信息中获取数据
-                    if gpu_id in gpu_detailed_info:
-                        detailed = gpu_detailed_info[gpu_id]
-                        gpu_names.append(detailed["name"])
-                        gpu_memory_used.append(f"{detailed['memory_used']}MB")
-                        gpu_memory_total.append(f"{detailed['memory_total']}MB")
-                        gpu_utilizations.append(f"{detailed['gpu_util']}%")
-                        gpu_memory_utilizations.append(f"{detailed['mem_util']}%")
-                        gpu_temperatures.append(f"{detailed['temperature']}°C")
-
-                        # 风扇转速可能为"N/A"或"[Not Supported]"
-                        fan_speed = detailed["fan_speed"]
-                        if fan_speed and fan_speed not in ["N/A", "[Not Supported]"]:
-                            gpu_fan_speeds.append(f"{fan_speed}%")
-                        else:
-                            gpu_fan_speeds.append("N/A")
-
-                        gpu_power_draws.append(f"{detailed['power_draw']}W")
-                        gpu_power_limits.append(f"{detailed['power_limit']}W")
+        # 容器PID与GPU进程PID求交集，按PID排序保证GPU顺序稳定
+        matched_pids = sorted(gpu_processes.keys() & set(container_pids), key=int)
+        seen_gpu_ids = set()
+
+        for pid in matched_pids:
+            gpu_info = gpu_processes[pid]
+            gpu_id = gpu_info["gpu_id"]
+
+            # 避免重复添加同一个GPU
+            if gpu_id not in seen_gpu_ids:
+                seen_gpu_ids.add(gpu_id)
+                gpu_ids.append(gpu_id)
+
+                # 从详细信息中获取数据
+                if gpu_id in gpu_detailed_info:
+                    detailed = gpu_detailed_info[gpu_id]
+                    gpu_names.append(detailed["name"])
+                    gpu_memory_used.append(f"{detailed['memory_used']}MB")
+                    gpu_memory_total.append(f"{detailed['memory_total']}MB")
+                    gpu_utilizations.append(f"{detailed['gpu_util']}%")
+                    gpu_memory_utilizations.append(f"{detailed['mem_util']}%")
+                    gpu_temperatures.append(f"{detailed['temperature']}°C")
+
+                    # 风扇转速可能为"N/A"或"[Not Supported]"
+                    fan_speed = detailed["fan_speed"]
+                    if fan_speed and fan_speed not in ["N/A", "[Not Supported]"]:
+                        gpu_fan_speeds.append(f"{fan_speed}%")
                     else:
-                        # 如果没有详细信息，使用N/A填充
-                        gpu_names.append("Unknown")
-                        gpu_memory_used.append("N/A")
-                        gpu_memory_total.append("N/A")
-                        gpu_utilizations.append("N/A")
-                        gpu_memory_utilizations.append("N/A")
-                        gpu_temperatures.append("N/A")
                         gpu_fan_speeds.append("N/A")
-                        gpu_power_draws.append("N/A")
-                        gpu_power_limits.append("N/A")
 
-                    self.logger.debug(
-                        f"容器 {container_name} 使用GPU {gpu_id}: {gpu_info}"
-                    )
+                    gpu_power_draws.append(f"{detailed['power_draw']}W")
+                    gpu_power_limits.append(f"{detailed['power_limit']}W")
+                else:
+                    # 如果没有详细信息，使用N/A填充
+                    gpu_names.append("Unknown")
+                    gpu_memory_used.append("N/A")
+                    gpu_memory_total.append("N/A")
+                    gpu_utilizations.append("N/A")
+                    gpu_memory_utilizations.append("N/A")
+                    gpu_temperatures.append("N/A")
+                    gpu_fan_speeds.append("N/A")
+                    gpu_power_draws.append("N/A")
+                    gpu_power_limits.append("N/A")
+
+                self.logger.debug(
+                    "容器 %s 使用GPU %s: %s", container_name, gpu_id, gpu_info
+                )
 
         # 汇总GPU使用情况
-        result = {
-            "gpu_count": str(len(gpu_ids)),
-            "gpu_ids": ",".join(gpu_ids) if gpu_ids else "N/A",
-            "gpu_names": ",".join(gpu_names) if gpu_names else "N/A",
-            "gpu_memory_used": ",".join(gpu_memory_used) if gpu_memory_used else "N/A",
-            "gpu_memory_total": (
-                ",".join(gpu_memory_total) if gpu_memory_total else "N/A"
-            ),
-            "gpu_utilization": (
-                ",".join(gpu_utilizations) if gpu_utilizations else "N/A"
-            ),
-            "gpu_memory_utilization": (
+        result = ContainerGPUInfo(
+            gpu_count=str(len(gpu_ids)),
+            gpu_ids=",".join(gpu_ids) if gpu_ids else "N/A",
+            gpu_names=",".join(gpu_names) if gpu_names else "N/A",
+            gpu_memory_used=",".join(gpu_memory_used) if gpu_memory_used else "N/A",
+            gpu_memory_total=",".join(gpu_memory_total) if gpu_memory_total else "N/A",
+            gpu_utilization=(",".join(gpu_utilizations) if gpu_utilizations else "N/A"),
+            gpu_memory_utilization=(
                 ",".join(gpu_memory_utilizations) if gpu_memory_utilizations else "N/A"
             ),
-            "gpu_temperature": (
-                ",".join(gpu_temperatures) if gpu_temperatures else "N/A"
-            ),
-            "gpu_fan_speed": ",".join(gpu_fan_speeds) if gpu_fan_speeds else "N/A",
-            "gpu_power_draw": ",".join(gpu_power_draws) if gpu_power_draws else "N/A",
-            "gpu_power_limit": (
-                ",".join(gpu_power_limits) if gpu_power_limits else "N/A"
-            ),
-        }
+            gpu_temperature=",".join(gpu_temperatures) if gpu_temperatures else "N/A",
+            gpu_fan_speed=",".join(gpu_fan_speeds) if gpu_fan_speeds else "N/A",
+            gpu_power_draw=",".join(gpu_power_draws) if gpu_power_draws else "N/A",
+            gpu_power_limit=self._join_power_limits(gpu_power_limits),
+        )
 
-        self.logger.debug(f"容器 {container_name} GPU汇总信息: {result}")
+        self.logger.debug("容器 %s GPU汇总信息: %s", container_name, result)
         return result
 
-    def get_gpu_utilization(self) -> Dict[str, Dict]:
+    def collect_container_gpu_info(
+        self,
+        containers: List[Dict],
+        gpu_processes: Dict[str, Dict],
+        gpu_detailed_info: Dict[str, Dict],
+    ) -> List[Tuple[Dict, ContainerGPUInfo]]:
         """
-        获取GPU利用率信息（保留用于兼容性）
+        并行获取多个容器的GPU使用信息
+
+        每个容器都需要查询一次容器进程（Docker API或docker top），这些调用都在等待
+        dockerd响应，使用线程池并行执行；没有GPU进程时无需查询容器进程，直接串行处理
+
+        Args:
+            containers: 容器信息列表
+            gpu_processes: PID到GPU信息的映射
+            gpu_detailed_info: GPU ID到详细信息的映射
 
         Returns:
-            GPU ID到利用率信息的映射字典
+            (容器信息, GPU使用信息) 列表，顺序与完成顺序一致
         """
-        try:
-            # 使用nvidia-smi查询GPU利用率
-            result = subprocess.run(
-                [
-                    "nvidia-smi",
-                    "--query-gpu=index,utilization.gpu,utilization.memory",
-                    "--format=csv,noheader,nounits",
-                ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                check=True,
-            )
+        if not gpu_processes or len(containers) <= 1:
+            return [
+                (
+                    container,
+                    self.get_gpu_info_for_container(
+                        container["name"],
+                        gpu_processes,
+                        gpu_detailed_info,
+                        container.get("container_id"),
+                    ),
+                )
+                for container in containers
+            ]
+
+        futures = {
+            self._pool.submit(
+                self.get_gpu_info_for_container,
+                container["name"],
+                gpu_processes,
+                gpu_detailed_info,
+                container.get("container_id"),
+            ): container
+            for container in containers
+        }
+        return [(futures[future], future.result()) for future in as_completed(futures)]
 
-            self.logger.debug(f"nvidia-smi GPU利用率输出:\n{result.stdout}")
+    def get_gpu_utilization(self) -> Dict[str, GPUSample]:
+        """
+        获取GPU利用率信息（保留用于兼容性），优先使用NVML，不可用时使用nvidia-smi命令
 
+        Returns:
+            GPU ID到利用率信息的映射字典
+        """
+        if not self._gpu_ready():
+            return {}
+        if self._nvml:
             gpu_util_map = {}
-            lines = result.stdout.strip().split("\n")
+            for index, handle in enumerate(self._nvml_handles):
+                gpu_util, mem_util = self._nvml_utilization(index, handle)
+                if gpu_util is not None:
+                    gpu_util_map[str(index)] = GPUSample(gpu_util, mem_util)
+            return gpu_util_map
 
-            for line in lines:
-                if line.strip():
-                    parts = [p.strip() for p in line.split(",")]
-                    if len(parts) >= 3:
-                        try:
-                            gpu_id = parts[0]
-                            gpu_util = parts[1]
-                            mem_util = parts[2]
+        # 使用nounits格式时利用率字段是纯数字，在这里一次转换为int；
+        # 不支持的GPU输出[N/A]，GPU利用率不可用时跳过该GPU
+        _int = int
+        gpu_util_map = {}
+        for gpu_id, fields in self._sample_gpu_once().items():
+            try:
+                gpu_util = _int(fields["utilization.gpu"])
+            except ValueError:
+                continue
+            try:
+                mem_util = _int(fields["utilization.memory"])
+            except ValueError:
+                mem_util = None
+            gpu_util_map[gpu_id] = GPUSample(gpu_util, mem_util)
+            self.logger.debug(
+                "GPU %s 利用率: GPU=%s%% MEM=%s%%", gpu_id, gpu_util, mem_util
+            )
+        return gpu_util_map
 
-                            gpu_util_map[gpu_id] = {
-                                "gpu_util": gpu_util,
-                                "mem_util": mem_util,
-                            }
-                            self.logger.debug(
-                                f"GPU {gpu_id} 利用率: GPU={gpu_util}% MEM={mem_util}%"
-                            )
-                        except (ValueError, IndexError):
-                            continue
+    def _handle_sigterm(self, signum, frame):
+        """SIGTERM信号处理：按中断处理，由run_monitoring统一清理"""
+        raise KeyboardInterrupt
 
-            return gpu_util_map
+    async def _monitor_loop(self, loop: asyncio.AbstractEventLoop):
+        """
+        监控循环协程
 
-        except subprocess.CalledProcessError as e:
-            self.logger.debug(f"获取GPU利用率失败: {e}")
-            return {}
-        except Exception as e:
-            self.logger.debug(f"处理GPU利用率时出错: {e}")
-            return {}
+        阻塞的采集调用放到默认线程池中执行，容器统计信息和GPU信息两条互不依赖的采集链路并发等待；
+        CSV记录提交给写入线程完成，文件I/O不占用监控周期的时间
 
-    def run_monitoring(self):
-        """
-        运行监控循环
+        Args:
+            loop: 运行该协程的事件循环
         """
-        self.logger.info("开始wemol资源监控...")
-
-        try:
-            while True:
-                # 记录开始时间
-                start_time = time.time()
+        # 按单调时钟的截止时间调度，不受系统时间调整影响，执行时间波动也不会累积漂移
+        next_tick = time.monotonic()
+        while True:
+            # 记录开始时间
+            start_time = time.monotonic()
+            # 丢弃上一轮的nvidia-smi查询结果
+            self._gpu_sample = None
+
+            # 本轮所有记录共用同一个采样时间，只格式化一次
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+
+            # 获取所有wemol容器，缓存5个监控间隔
+            if start_time >= self._containers_cache_expiry:
+                self._containers_cache = await loop.run_in_executor(
+                    None, self.get_wemol_containers
+                )
+                self._containers_cache_expiry = start_time + self.interval * 5
+            containers = self._containers_cache
+
+            # 关闭已结束任务的CSV文件
+            self._write_q.put(
+                (
+                    self.close_inactive_csv_files,
+                    ([container["task_id"] for container in containers],),
+                )
+            )
 
-                # 获取所有wemol容器
-                containers = self.get_wemol_containers()
+            if not containers:
+                self.logger.warning("未找到任何wemol_rc_task容器，等待下次检查...")
+            else:
+                # 容器统计信息与GPU信息（每轮只查询一次，所有容器共用）并发获取
+                (all_stats, gone), (gpu_detailed_info, gpu_processes) = (
+                    await asyncio.gather(
+                        loop.run_in_executor(
+                            None, self.collect_container_stats, containers
+                        ),
+                        loop.run_in_executor(None, self.collect_gpu_info),
+                    )
+                )
 
-                if not containers:
-                    self.logger.warning("未找到任何wemol_rc_task容器，等待下次检查...")
-                else:
-                    # 为每个容器获取统计信息并记录
-                    for container in containers:
-                        stats = self.get_container_stats(container["name"])
-                        if stats:
-                            self.record_stats(container, stats)
-                        else:
-                            self.logger.warning(
-                                f"无法获取容器 {container['name']} 的统计信息"
-                            )
+                recordable = []
+                for container in containers:
+                    if container["name"] in all_stats:
+                        recordable.append(container)
+                    elif container["name"] in gone:
+                        self.logger.info(f"容器 {container['name']} 已退出")
+                        # 下一轮重新查询容器列表
+                        self._containers_cache_expiry = 0.0
+                    else:
+                        self.logger.warning(
+                            f"无法获取容器 {container['name']} 的统计信息"
+                        )
+
+                container_gpu_info = await loop.run_in_executor(
+                    None,
+                    self.collect_container_gpu_info,
+                    recordable,
+                    gpu_processes,
+                    gpu_detailed_info,
+                )
+                for container, gpu_info in container_gpu_info:
+                    self._write_q.put(
+                        (
+                            self.record_stats,
+                            (
+                                container,
+                                all_stats[container["name"]],
+                                gpu_info,
+                                timestamp,
+                            ),
+                        )
+                    )
 
-                # 计算已执行时间
-                execution_time = time.time() - start_time
+            # 计算到下一个截止时间还需等待多久
+            next_tick += self.interval
+            now = time.monotonic()
+            execution_time = now - start_time
+            sleep_time = next_tick - now
+
+            if sleep_time <= 0:
+                # 超时后跳过已经错过的轮次，在截止时间网格上等到下一轮，避免采集连续背靠背执行加重负载
+                skipped = int(-sleep_time // self.interval) + 1
+                next_tick += skipped * self.interval
+                sleep_time = next_tick - now
+                self.logger.warning(
+                    f"程序执行时间({execution_time:.2f}s)超过设定间隔({self.interval}s)，"
+                    f"跳过 {skipped} 轮监控"
+                )
 
-                # 计算需要sleep的时间，确保总间隔为设定值
-                sleep_time = max(0, self.interval - execution_time)
+            self.logger.debug(
+                "本轮执行时间: %.2fs, 等待时间: %.2fs", execution_time, sleep_time
+            )
+            # 等待下次监控
+            await asyncio.sleep(sleep_time)
 
-                if execution_time > self.interval:
-                    self.logger.warning(
-                        f"程序执行时间({execution_time:.2f}s)超过设定间隔({self.interval}s)"
-                    )
-                else:
-                    self.logger.debug(
-                        f"本轮执行时间: {execution_time:.2f}s, 等待时间: {sleep_time:.2f}s"
-                    )
+    def run_monitoring(self):
+        """
+        运行监控循环
+        """
+        self.logger.info("开始wemol资源监控...")
 
-                # 等待下次监控
-                time.sleep(sleep_time)
+        # 收到SIGTERM时同样正常退出，确保缓冲中的数据写入CSV文件
+        previous_sigterm = signal.signal(signal.SIGTERM, self._handle_sigterm)
 
+        # 兼容Python 3.6，不使用asyncio.run
+        loop = asyncio.new_event_loop()
+        task = loop.create_task(self._monitor_loop(loop))
+        try:
+            loop.run_until_complete(task)
         except KeyboardInterrupt:
             self.logger.info("收到中断信号，停止监控...")
+            # 取消监控协程，正在线程池中执行的采集调用不再等待
+            task.cancel()
+            try:
+                loop.run_until_complete(task)
+            except (asyncio.CancelledError, KeyboardInterrupt):
+                pass
         except Exception as e:
             self.logger.error(f"监控过程中出现错误: {e}")
             raise
+        finally:
+            # 清理期间忽略再次收到的SIGTERM，避免写入线程和CSV文件只关闭一半
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+            try:
+                loop.close()
+                self.close()
+            finally:
+                signal.signal(signal.SIGTERM, previous_sigterm)
 
 
 def main():
     """主函数"""
     import argparse
 
+    def positive_int(value: str) -> int:
+        """argparse类型检查：监控间隔必须是正整数"""
+        number = int(value)
+        if number <= 0:
+            raise argparse.ArgumentTypeError(f"必须大于0: {value}")
+        return number
+
     parser = argparse.ArgumentParser(
         description="Wemol平台作业模块调度资源监控记录程序"
     )
     parser.add_argument(
-        "--interval", type=int, default=5, help="监控间隔时间（秒），默认5秒"
+        "--interval", type=positive_int, default=5, help="监控间隔时间（秒），默认5秒"
     )
     parser.add_argument(
         "--log-level",